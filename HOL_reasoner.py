@@ -1,9 +1,12 @@
+from graph_index import GraphIndex
+from instrumentation import metrics
 
 class HOL:
-    def __init__(self, graph, EX):
+    def __init__(self, graph, EX, index=None):
         # Initialize RDF graph
         self.g = graph
         self.EX = EX
+        self.index = index if index is not None else GraphIndex.for_graph(graph, EX)
         
         
     def apply_higher_order_logic(self):
@@ -13,15 +16,19 @@ class HOL:
             """
             print("Applying simple higher-order logic rules...")
             
-            # Example rule: If A contains B and B contains C, then A contains C (transitive consideration)
-            new_triples = []
+            with metrics.stage("reason.hol") as record:
+                record["triples_before"] = len(self.g)
+                # Example rule: If A contains B and B contains C, then A contains C (transitive consideration)
+                new_triples = []
             
-            for s, p, o in self.g.triples((None, self.EX.contains, None)):
-                for _, _, o2 in self.g.triples((o, self.EX.contains, None)):
-                    new_triples.append((s, self.EX.contains, o2))
+                for s, o in self.index.containment_pairs():
+                    for o2 in self.index.contained_in(o):
+                        new_triples.append((s, self.EX.contains, o2))
             
-            # Add the new triples to the graph
-            for s, p, o in new_triples:
-                self.g.add((s, p, o))
+                # Add the new triples to the graph
+                for s, p, o in new_triples:
+                    self.g.add((s, p, o))
+                record["triples_after"] = len(self.g)
+            metrics.increment("triples_inferred", record["triples_after"] - record["triples_before"], reasoner="hol")
             
             print(f"After HOL rules, graph contains {len(self.g)} triples")
\ No newline at end of file
@@ -1,7 +1,11 @@
+from graph_index import GraphIndex
+from instrumentation import metrics
+
 class ULKBrules:
-    def __init__(self, graph, EX):
+    def __init__(self, graph, EX, index=None):
         self.g = graph
         self.EX = EX
+        self.index = index if index is not None else GraphIndex.for_graph(graph, EX)
        
         
     def apply_universal_logic_knowledge_base(self):
@@ -11,22 +15,20 @@ class ULKBrules:
             """
             print("Applying ULKB-like rules...")
             
-            # Rule: Elements with similar classes might represent similar concepts
-            class_elements = {}
+            with metrics.stage("reason.ulkb") as record:
+                record["triples_before"] = len(self.g)
+                # Rule: Elements with similar classes might represent similar concepts
+                # Group elements by class
+                class_elements = self.index.class_groups()
             
-            # Group elements by class
-            for s, _, o in self.g.triples((None, self.EX.hasClass, None)):
-                cls = str(o)
-                if cls not in class_elements:
-                    class_elements[cls] = []
-                class_elements[cls].append(s)
-            
-            # Add semantic similarity relationships for elements with the same class
-            for cls, elements in class_elements.items():
-                if len(elements) > 1:
-                    for i, elem1 in enumerate(elements):
-                        for elem2 in elements[i+1:]:
-                            self.g.add((elem1, self.EX.hasSimilarPurposeTo, elem2))
-                            self.g.add((elem2, self.EX.hasSimilarPurposeTo, elem1))
+                # Add semantic similarity relationships for elements with the same class
+                for cls, elements in class_elements.items():
+                    if len(elements) > 1:
+                        for i, elem1 in enumerate(elements):
+                            for elem2 in elements[i+1:]:
+                                self.g.add((elem1, self.EX.hasSimilarPurposeTo, elem2))
+                                self.g.add((elem2, self.EX.hasSimilarPurposeTo, elem1))
+                record["triples_after"] = len(self.g)
+            metrics.increment("triples_inferred", record["triples_after"] - record["triples_before"], reasoner="ulkb")
             
             print(f"After ULKB rules, graph contains {len(self.g)} triples")
\ No newline at end of file
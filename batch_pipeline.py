@@ -0,0 +1,272 @@
+"""
+Module: batch_pipeline.py
+Description: Implements the BatchPipeline class which processes a list of URLs with overlapping fetch, build/reason
+and merge stages, connected by bounded queues, and merges every page into one RDF store.
+
+Usage:
+    python batch_pipeline.py urls.txt --reasoner owl --fetch-workers 4 --build-workers 4 --output merged.ttl
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from rdflib import Graph, Namespace, RDFS
+from rdflib.namespace import OWL
+
+from common import logger
+from graph_index import GraphIndex
+from HOL_reasoner import HOL
+from instrumentation import metrics
+from knowledge_graph import KnowledgeGraph
+from ontology_setup import Ontology
+from owl_reasoner import OWLreasoner
+from rdfs_reasoner import RDFSreasoner
+from ULKB_logic_rules import ULKBrules
+from webpage_fetcher import WebpageFetcher
+
+REASONERS = ("owl", "rdfs", "hol", "ulkb", "none")
+
+# Queue sentinel marking the end of a stage's output
+_DONE = object()
+
+# Fingerprints of the template subtrees this worker process has already returned to the merge stage
+_seen_templates = set()
+
+
+def read_urls(path):
+    """Read one URL per line from a file, skipping blank lines and # comments"""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+
+def build_page_graph(html_content, url, base_namespace, scope, reasoner="owl", collect_metrics=False,
+                     trace_memory=False, share_templates=False):
+    """
+    Build and reason over the knowledge graph of one page.
+
+    Runs in a worker process, so it only takes and returns picklable values. With share_templates,
+    boilerplate subtrees get content-addressed URIs and are stored once in the merged graph. Without
+    a reasoner, a worker also skips templates it has already returned; a reasoner needs the whole
+    page, so then they are rebuilt and only deduplicated by the merge.
+
+    :return: (list of the page graph's triples, drained (records, counters) of this page's metrics or None).
+        Triples are returned as rdflib terms rather than serialized, since OWL-RL can infer triples
+        with literal subjects that N-Triples cannot represent.
+    """
+    if collect_metrics and not metrics.enabled:
+        metrics.enable(trace_memory=trace_memory)
+
+    g = Graph()
+    EX = Namespace(base_namespace)
+    Ontology(g, EX)
+    seen_templates = set(_seen_templates) if share_templates and reasoner == "none" else None
+    kg_builder = KnowledgeGraph(g, base_namespace, scope=scope, share_templates=share_templates,
+                                seen_templates=seen_templates)
+    kg_builder.build_knowledge_graph(html_content, url)
+
+    if reasoner == "owl":
+        OWLreasoner(g).apply_owl_reasoning()
+    elif reasoner == "rdfs":
+        RDFSreasoner(g).apply_rdfs_reasoning()
+    elif reasoner == "hol":
+        HOL(g, EX, kg_builder.index).apply_higher_order_logic()
+    elif reasoner == "ulkb":
+        ULKBrules(g, EX, kg_builder.index).apply_universal_logic_knowledge_base()
+
+    if seen_templates is not None:
+        _seen_templates.update(seen_templates)
+    return list(g), metrics.drain() if collect_metrics else None
+
+
+class BatchPipeline:
+    """
+    Class for processing many webpages as a pipeline instead of one after another.
+
+    I/O-bound fetching runs in a thread pool, CPU-bound graph building and reasoning in a
+    process pool, and the merge into the shared store on the calling thread. Stages are linked
+    by bounded queues, so a slow stage applies backpressure instead of buffering every page,
+    and throughput approaches that of the slowest stage.
+
+    @Feature End-to-End Processing via Main Entry Point
+    @Scenario Processing a list of URLs into one knowledge graph
+    """
+
+    def __init__(self, base_namespace="http://example.org/", reasoner="owl", fetch_workers=4,
+                 build_workers=None, queue_size=8, share_templates=False):
+        """
+        Initialize the BatchPipeline and the merged store.
+
+        :param base_namespace: Namespace shared by all pages in the merged store.
+        :param reasoner: One of "owl", "rdfs", "hol", "ulkb" or "none", applied per page.
+        :param fetch_workers: Number of fetch threads.
+        :param build_workers: Number of build/reason processes. Defaults to the number of CPUs.
+        :param queue_size: Capacity of the queues between stages.
+        :param share_templates: Store header/nav/footer/aside subtrees repeated across pages only once.
+        :raises ValueError: If the reasoner is not supported.
+        """
+        if reasoner not in REASONERS:
+            raise ValueError(f"Unsupported reasoner '{reasoner}', expected one of {REASONERS}")
+
+        self.base_namespace = base_namespace
+        self.reasoner = reasoner
+        self.fetch_workers = fetch_workers
+        self.build_workers = build_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.share_templates = share_templates
+
+        self.g = Graph()
+        self.EX = Namespace(base_namespace)
+        self.g.bind("ex", self.EX)
+        self.g.bind("owl", OWL)
+        self.g.bind("rdfs", RDFS)
+        Ontology(self.g, self.EX)
+        self.index = GraphIndex.for_graph(self.g, self.EX)
+
+    def _fetch_stage(self, urls, fetched):
+        """Fetch pages in worker threads and hand them to the build stage"""
+        fetcher = WebpageFetcher()
+
+        def fetch_one(position, url):
+            try:
+                fetched.put((position, url, fetcher.fetch(url), None))
+            except Exception as e:
+                logger.error(f"Skipping {url}: {e}")
+                fetched.put((position, url, None, e))
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            for position, url in enumerate(urls):
+                pool.submit(fetch_one, position, url)
+        fetched.put(_DONE)
+
+    def _build_stage(self, fetched, built, in_flight, pool):
+        """
+        Submit fetched pages to the process pool, at most queue_size at a time.
+
+        Futures are handed to the merge stage in submission order, rather than queued from done
+        callbacks, so _DONE can only follow the last page. A page that cannot be submitted (e.g.
+        the pool broke because a worker died) is reported as failed, and _DONE is queued even if
+        this stage fails, so the merge loop never waits forever.
+        """
+        try:
+            while True:
+                item = fetched.get()
+                if item is _DONE:
+                    break
+                position, url, html_content, error = item
+                in_flight.acquire()
+                if error is not None or not html_content:
+                    built.put((url, None, error or "empty page"))
+                    continue
+                try:
+                    future = pool.submit(build_page_graph, html_content, url, self.base_namespace,
+                                         f"p{position}_", self.reasoner, metrics.enabled, metrics.trace_memory,
+                                         self.share_templates)
+                except Exception as e:
+                    logger.error(f"Could not submit {url}: {e}")
+                    built.put((url, None, e))
+                    continue
+                built.put((url, future, None))
+        finally:
+            built.put(_DONE)
+
+    def run(self, urls):
+        """
+        Process every URL and merge the page graphs into self.g.
+
+        :param urls: Iterable of URLs.
+        :return: A list of per-page results: dicts with "url", "status", "triples" and "error".
+        """
+        fetched = queue.Queue(maxsize=self.queue_size)
+        built = queue.Queue()
+        # Bounds the pages between the build and merge stages (queued, building or waiting to merge)
+        in_flight = threading.BoundedSemaphore(self.queue_size)
+        results = []
+
+        # Workers are started from the build thread while fetch threads run; forking then could copy a held lock
+        with ProcessPoolExecutor(max_workers=self.build_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            stages = [
+                threading.Thread(target=self._fetch_stage, args=(list(urls), fetched), daemon=True),
+                threading.Thread(target=self._build_stage, args=(fetched, built, in_flight, pool), daemon=True),
+            ]
+            for stage in stages:
+                stage.start()
+
+            # Merge stage: runs on this thread so the store is only written from one place
+            while True:
+                item = built.get()
+                if item is _DONE:
+                    break
+                url, future, error = item
+                if future is not None:
+                    try:
+                        built_page = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to build {url}: {e}")
+                        error = e
+                if error is not None:
+                    metrics.increment("pages", status="failed")
+                    results.append({"url": url, "status": "failed", "triples": 0, "error": str(error)})
+                else:
+                    triples, worker_metrics = built_page
+                    if worker_metrics:
+                        metrics.merge(*worker_metrics)
+                    with metrics.stage("merge", url=url) as record:
+                        before = len(self.g)
+                        self.g.addN((s, p, o, self.g) for s, p, o in triples)
+                        record["triples"] = len(self.g) - before
+                    metrics.increment("pages", status="ok")
+                    results.append({"url": url, "status": "ok", "triples": record["triples"], "error": None})
+                    print(f"Merged {url}: store contains {len(self.g)} triples")
+                in_flight.release()
+
+            for stage in stages:
+                stage.join()
+
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build one knowledge graph from a list of URLs")
+    parser.add_argument("urls", nargs="+", help="URLs, or a file with one URL per line")
+    parser.add_argument("--namespace", default="http://example.org/")
+    parser.add_argument("--reasoner", default="owl", choices=REASONERS)
+    parser.add_argument("--fetch-workers", type=int, default=4)
+    parser.add_argument("--build-workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--share-templates", action="store_true",
+                        help="Store header/nav/footer/aside subtrees repeated across pages only once")
+    parser.add_argument("--output", default=None, help="Write the merged graph as Turtle")
+    parser.add_argument("--metrics-jsonl", default=None, help="Append per-stage metrics to this JSON lines file")
+    parser.add_argument("--metrics-prom", default=None, help="Write metrics in Prometheus text format to this file")
+    parser.add_argument("--trace-memory", action="store_true", help="Record peak memory per stage with tracemalloc")
+    parser.add_argument("--profile-dir", default=None, help="Dump a cProfile of each top-level stage here")
+    args = parser.parse_args(argv)
+
+    if args.metrics_jsonl or args.metrics_prom or args.profile_dir:
+        metrics.enable(trace_memory=args.trace_memory, profile_dir=args.profile_dir)
+
+    urls = []
+    for entry in args.urls:
+        urls.extend(read_urls(entry) if os.path.isfile(entry) else [entry])
+
+    pipeline = BatchPipeline(args.namespace, args.reasoner, args.fetch_workers, args.build_workers, args.queue_size,
+                             args.share_templates)
+    results = pipeline.run(urls)
+    failed = [result for result in results if result["status"] != "ok"]
+    print(f"Processed {len(results)} pages ({len(failed)} failed), store contains {len(pipeline.g)} triples")
+
+    if args.output:
+        pipeline.g.serialize(destination=args.output, format="turtle")
+        print(f"Knowledge graph saved to {args.output}")
+    if args.metrics_jsonl:
+        metrics.export_jsonl(args.metrics_jsonl)
+    if args.metrics_prom:
+        metrics.export_prometheus(args.metrics_prom)
+
+
+if __name__ == "__main__":
+    main()
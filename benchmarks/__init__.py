@@ -0,0 +1,4 @@
+"""
+Package: benchmarks
+Description: Offline benchmarks for the scraping, knowledge graph and search pipeline.
+"""
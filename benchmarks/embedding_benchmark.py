@@ -0,0 +1,80 @@
+"""
+Module: benchmarks/embedding_benchmark.py
+Description: Reports sentences per second for each embedding backend and checks that every backend stays
+within a cosine tolerance of the PyTorch reference embeddings.
+
+Usage:
+    python -m benchmarks.embedding_benchmark --sentences 2000 --threads 4 --batch-size 64
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from embedding_backend import EmbeddingBackend, DEFAULT_MODEL_NAME
+
+SAMPLE_TEXTS = [
+    "Amazon Essentials Men's Derby Shoe",
+    "Price: $34.90 with free returns on eligible orders",
+    "Only 3 left in stock - order soon.",
+    "Customers say these shoes are comfortable and true to size.",
+    "Add to Cart",
+    "Ships from and sold by Amazon.com",
+    "4.3 out of 5 stars from 2,150 ratings",
+    "Synthetic sole with a lace-up closure",
+]
+
+# Maximum cosine distance of any backend's embeddings from the torch reference
+COSINE_TOLERANCE = 0.01
+
+
+def make_sentences(count):
+    """Build a deterministic list of product-page-like sentences"""
+    return [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} ({i})" for i in range(count)]
+
+
+def run_backend(backend, sentences, num_threads, batch_size, repeats):
+    """Encode the sentences with one backend and return (embeddings, sentences per second)"""
+    embedder = EmbeddingBackend(DEFAULT_MODEL_NAME, backend=backend, num_threads=num_threads, batch_size=batch_size)
+    embedder.encode(sentences[:batch_size])  # warm-up
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        embeddings = embedder.encode(sentences)
+        best = min(best, time.perf_counter() - start)
+    return embeddings, len(sentences) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the embedding backends")
+    parser.add_argument("--backends", nargs="+", default=list(EmbeddingBackend.BACKENDS),
+                        choices=EmbeddingBackend.BACKENDS)
+    parser.add_argument("--sentences", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=COSINE_TOLERANCE,
+                        help="Maximum allowed cosine distance from the torch reference embeddings")
+    args = parser.parse_args(argv)
+
+    sentences = make_sentences(args.sentences)
+    reference, _ = run_backend("torch", sentences, args.threads, args.batch_size, 1)
+
+    failed = False
+    print(f"{'backend':<10} {'sentences/s':>12} {'min cosine':>11} {'status':>7}")
+    for backend in args.backends:
+        embeddings, throughput = run_backend(backend, sentences, args.threads, args.batch_size, args.repeats)
+        # Embeddings are normalised, so the row-wise dot product is the cosine similarity
+        min_cosine = float(np.min(np.sum(embeddings * reference, axis=1)))
+        ok = min_cosine >= 1.0 - args.tolerance
+        failed = failed or not ok
+        print(f"{backend:<10} {throughput:>12.1f} {min_cosine:>11.4f} {'ok' if ok else 'FAIL':>7}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
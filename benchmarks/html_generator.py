@@ -0,0 +1,61 @@
+"""
+Module: benchmarks/html_generator.py
+Description: Generates synthetic product-page-like HTML with controllable DOM size, depth, list fan-out, class reuse
+and text volume, so benchmarks do not depend on live pages.
+"""
+
+import random
+
+WORDS = ("price", "shoe", "leather", "black", "size", "delivery", "free", "returns", "rating", "stars",
+         "customer", "review", "comfort", "sole", "lace", "stock", "order", "today", "cart", "brand")
+
+CONTAINER_TAGS = ("div", "section", "article", "ul", "nav")
+LEAF_TAGS = ("p", "span", "h2", "h3", "li", "button", "label", "strong")
+
+
+def generate_page(elements=1000, depth=6, fan_out=8, class_reuse=0.8, text_words=8, seed=0):
+    """
+    Generate a synthetic HTML page.
+
+    :param elements: Approximate number of elements in the body.
+    :param depth: Maximum nesting depth below the body.
+    :param fan_out: Maximum number of children per container (list length).
+    :param class_reuse: Between 0 and 1; higher values draw CSS classes from a smaller pool.
+    :param text_words: Number of words in each leaf element's text.
+    :param seed: Random seed, so the same parameters always produce the same page.
+    :return: The HTML document as a string.
+    """
+    rng = random.Random(seed)
+    class_pool = [f"c{i}" for i in range(max(1, int(elements * (1.0 - class_reuse))))]
+    budget = [elements]
+    parts = []
+
+    def text():
+        return " ".join(rng.choice(WORDS) for _ in range(text_words))
+
+    def emit(level):
+        budget[0] -= 1
+        classes = " ".join(rng.sample(class_pool, min(len(class_pool), rng.randint(1, 2))))
+        if level >= depth or budget[0] <= 0 or rng.random() < 0.25:
+            tag = rng.choice(LEAF_TAGS)
+            parts.append(f'<{tag} class="{classes}">{text()}</{tag}>')
+            return
+        tag = rng.choice(CONTAINER_TAGS)
+        child_tag = "li" if tag == "ul" else None
+        parts.append(f'<{tag} class="{classes}">')
+        for _ in range(rng.randint(1, fan_out)):
+            if budget[0] <= 0:
+                break
+            if child_tag:
+                budget[0] -= 1
+                parts.append(f'<li class="{rng.choice(class_pool)}">{text()}</li>')
+            else:
+                emit(level + 1)
+        parts.append(f"</{tag}>")
+
+    while budget[0] > 0:
+        emit(1)
+
+    body = "".join(parts)
+    return (f"<!DOCTYPE html><html><head><title>Synthetic page {seed}</title></head>"
+            f"<body><header><h1>{text()}</h1></header>{body}<footer><p>{text()}</p></footer></body></html>")
@@ -0,0 +1,65 @@
+"""
+Module: benchmarks/import_time.py
+Description: Measures the cold import time of each entry-point module in a fresh interpreter (python -X importtime)
+and checks it against a per-module budget, so heavy dependencies do not creep back into module-level imports.
+
+Usage:
+    python -m benchmarks.import_time
+"""
+
+import os
+import subprocess
+import sys
+
+# Cold import budget per module, in seconds. Heavy dependencies (torch, playwright, owlrl, bs4,
+# networkx, pyvis) are imported where they are used, so none of these should pull them in.
+IMPORT_BUDGETS = {
+    "webpage_fetcher": 0.15,
+    "cli": 0.15,
+    "knowledge_graph": 0.6,
+    "sparql_query_search": 0.6,
+    "visualization": 0.6,
+    "batch_pipeline": 0.8,
+    "main": 0.8,
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module):
+    """
+    Import a module in a fresh interpreter and return its cumulative import time in seconds.
+
+    :param module: Name of the module to import.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=REPO_ROOT, check=True,
+    )
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    for line in reversed(completed.stderr.splitlines()):
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def measure_all(budgets=IMPORT_BUDGETS):
+    """Return {module: {"seconds", "budget", "ok"}} for every module with a budget"""
+    results = {}
+    for module, budget in budgets.items():
+        seconds = measure_import(module)
+        results[module] = {"seconds": seconds, "budget": budget, "ok": seconds <= budget}
+    return results
+
+
+def main():
+    results = measure_all()
+    print(f"{'module':<22} {'import s':>9} {'budget s':>9} {'status':>7}")
+    for module, result in results.items():
+        print(f"{module:<22} {result['seconds']:>9.3f} {result['budget']:>9.3f} {'ok' if result['ok'] else 'OVER':>7}")
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Module: benchmarks/page_server.py
+Description: Implements the PageServer class, a local HTTP server that serves generated HTML from memory and captured
+HTML files from a directory, so WebpageFetcher can be benchmarked without network access.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class PageServer:
+    """
+    Local HTTP server for benchmark pages, used as a context manager.
+
+    Pages registered with add_page() are served from memory; any other path is looked up in
+    the captured-pages directory, if one was given.
+    """
+
+    def __init__(self, captured_dir=None, host="127.0.0.1", port=0):
+        """
+        Initialize the PageServer.
+
+        :param captured_dir: Optional directory of captured .html files to serve.
+        :param host: Interface to bind to.
+        :param port: Port to bind to; 0 picks a free port.
+        """
+        self.captured_dir = captured_dir
+        self.pages = {}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = server.read(self.path.split("?", 1)[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def read(self, path):
+        """Return the HTML served at a path, or None"""
+        if path in self.pages:
+            return self.pages[path]
+        if self.captured_dir:
+            file_path = os.path.realpath(os.path.join(self.captured_dir, path.lstrip("/")))
+            if file_path.startswith(os.path.realpath(self.captured_dir)) and os.path.isfile(file_path):
+                with open(file_path, encoding="utf-8", errors="replace") as f:
+                    return f.read()
+        return None
+
+    def add_page(self, path, html):
+        """
+        Serve an HTML string at the given path.
+
+        :return: The full URL of the page.
+        """
+        path = "/" + path.lstrip("/")
+        self.pages[path] = html
+        return self.url(path)
+
+    def captured_urls(self):
+        """Return the URLs of every .html file in the captured-pages directory"""
+        if not self.captured_dir:
+            return []
+        return [self.url(name) for name in sorted(os.listdir(self.captured_dir)) if name.endswith(".html")]
+
+    def url(self, path):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{path.lstrip('/')}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,196 @@
+"""
+Module: benchmarks/run_benchmarks.py
+Description: Offline end-to-end benchmark suite. Serves generated (and optionally captured) HTML from a local
+HTTP server and drives WebpageFetcher, KnowledgeGraph.build_knowledge_graph, each reasoner and QueryBasedSearch
+at several scales, recording per-stage timings to JSON for comparison across commits.
+
+Usage:
+    python -m benchmarks.run_benchmarks --scales small medium --output bench.json
+    python -m benchmarks.run_benchmarks --output new.json --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from rdflib import Graph, Literal, Namespace
+
+from benchmarks.html_generator import generate_page
+from benchmarks.import_time import measure_all
+from benchmarks.page_server import PageServer
+from instrumentation import metrics
+from knowledge_graph import KnowledgeGraph
+from ontology_setup import Ontology
+
+NAMESPACE = "http://example.org/"
+
+# Generator parameters per scale; see benchmarks.html_generator.generate_page
+SCALES = {
+    "small": {"elements": 200, "depth": 5, "fan_out": 6, "class_reuse": 0.8, "text_words": 6},
+    "medium": {"elements": 2000, "depth": 8, "fan_out": 10, "class_reuse": 0.9, "text_words": 10},
+    "large": {"elements": 10000, "depth": 12, "fan_out": 20, "class_reuse": 0.95, "text_words": 12},
+}
+
+REASONERS = ("owl", "rdfs", "hol", "ulkb")
+
+SEARCH_QUERY = """
+SELECT ?element ?text
+WHERE {
+?element ex:hasText ?text .
+FILTER(CONTAINS(LCASE(?text), ?keyword))
+}
+"""
+
+
+def git_commit():
+    """Return the current git commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_graph(html_content, url):
+    """Build a fresh knowledge graph for one page"""
+    g = Graph()
+    EX = Namespace(NAMESPACE)
+    Ontology(g, EX)
+    kg_builder = KnowledgeGraph(g, NAMESPACE)
+    kg_builder.build_knowledge_graph(html_content, url)
+    return g, EX, kg_builder
+
+
+def apply_reasoner(name, g, EX, kg_builder):
+    if name == "owl":
+        from owl_reasoner import OWLreasoner
+        OWLreasoner(g).apply_owl_reasoning()
+    elif name == "rdfs":
+        from rdfs_reasoner import RDFSreasoner
+        RDFSreasoner(g).apply_rdfs_reasoning()
+    elif name == "hol":
+        from HOL_reasoner import HOL
+        HOL(g, EX, kg_builder.index).apply_higher_order_logic()
+    elif name == "ulkb":
+        from ULKB_logic_rules import ULKBrules
+        ULKBrules(g, EX, kg_builder.index).apply_universal_logic_knowledge_base()
+
+
+def summarize(records):
+    """Aggregate stage records into {stage: {"count", "total_seconds", "mean_seconds", ...}}"""
+    stages = {}
+    for record in records:
+        stage = stages.setdefault(record["stage"], {"count": 0, "total_seconds": 0.0})
+        stage["count"] += 1
+        stage["total_seconds"] += record["seconds"]
+        if "peak_bytes" in record:
+            stage["peak_bytes"] = max(stage.get("peak_bytes", 0), record["peak_bytes"])
+        for key in ("triples", "triples_after", "bytes", "sentences"):
+            if key in record:
+                stage[key] = record[key]
+    for stage in stages.values():
+        stage["mean_seconds"] = stage["total_seconds"] / stage["count"]
+    return stages
+
+
+def bench_page(url, html_content, args, embedder):
+    """Run every benchmarked stage on one page and return its stage summary"""
+    metrics.reset()
+
+    if not args.skip_fetch:
+        from webpage_fetcher import WebpageFetcher
+        html_content = WebpageFetcher().fetch(url)
+
+    for _ in range(args.repeats):
+        build_graph(html_content, url)
+
+    for reasoner in args.reasoners:
+        g, EX, kg_builder = build_graph(html_content, url)
+        apply_reasoner(reasoner, g, EX, kg_builder)
+
+    if embedder is not None:
+        from sparql_query_search import QueryBasedSearch
+        g, EX, kg_builder = build_graph(html_content, url)
+        search = QueryBasedSearch(g, EX, index=kg_builder.index, embedder=embedder)
+        for _ in range(args.repeats):
+            search.search_query("product price", threshold=0.3)
+            list(search.sparql_query(SEARCH_QUERY, initBindings={"keyword": Literal("price")},
+                                     initNs={"ex": EX}, cache_results=True))
+
+    return summarize(metrics.drain()[0])
+
+
+def compare(current, baseline):
+    """Print mean stage times of this run against a previous results file"""
+    print(f"\n{'page':<14} {'stage':<16} {'baseline s':>11} {'current s':>11} {'ratio':>7}")
+    for page, result in current["pages"].items():
+        previous = baseline.get("pages", {}).get(page, {}).get("stages", {})
+        for stage, summary in result["stages"].items():
+            if stage in previous and previous[stage]["mean_seconds"] > 0:
+                before, after = previous[stage]["mean_seconds"], summary["mean_seconds"]
+                print(f"{page:<14} {stage:<16} {before:>11.4f} {after:>11.4f} {after / before:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks")
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"], choices=list(SCALES))
+    parser.add_argument("--reasoners", nargs="+", default=list(REASONERS), choices=REASONERS)
+    parser.add_argument("--captured-dir", default=None, help="Directory of captured .html pages to benchmark too")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-fetch", action="store_true", help="Feed the HTML directly instead of using Playwright")
+    parser.add_argument("--skip-search", action="store_true", help="Skip semantic search (avoids loading the model)")
+    parser.add_argument("--backend", default="torch", help="Embedding backend for semantic search")
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--skip-imports", action="store_true", help="Skip the import-time budget check")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="Previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    metrics.enable(trace_memory=args.trace_memory)
+
+    # Load the embedding model once and share it between pages
+    embedder = None
+    if not args.skip_search:
+        from embedding_backend import EmbeddingBackend
+        embedder = EmbeddingBackend(backend=args.backend)
+
+    results = {
+        "meta": {"commit": git_commit(), "timestamp": time.time(), "python": platform.python_version(),
+                 "platform": platform.platform(), "repeats": args.repeats, "reasoners": args.reasoners},
+        "pages": {},
+    }
+
+    if not args.skip_imports:
+        results["imports"] = measure_all()
+        for module, result in results["imports"].items():
+            if not result["ok"]:
+                print(f"Import of {module} took {result['seconds']:.3f}s, over its {result['budget']:.3f}s budget")
+
+    with PageServer(args.captured_dir) as server:
+        pages = []
+        for scale in args.scales:
+            html_content = generate_page(seed=args.seed, **SCALES[scale])
+            pages.append((scale, SCALES[scale], server.add_page(f"{scale}.html", html_content), html_content))
+        for url in server.captured_urls():
+            name = url.rsplit("/", 1)[-1]
+            pages.append((name, {"captured": True}, url, server.read("/" + name)))
+
+        for name, params, url, html_content in pages:
+            print(f"Benchmarking {name} ({len(html_content)} bytes)...")
+            results["pages"][name] = {"params": params, "stages": bench_page(url, html_content, args, embedder)}
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0 if all(result["ok"] for result in results.get("imports", {}).values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Module: cli.py
+Description: Split entry points for the individual pipeline steps. Each subcommand imports only what it needs, so a
+fetch-only worker never loads rdflib or torch and a SPARQL-only query never loads the embedding model.
+
+Usage:
+    python cli.py fetch URL --output page.html
+    python cli.py build page.html --url URL --output graph.ttl
+    python cli.py reason graph.ttl --reasoner owl --output reasoned.ttl
+    python cli.py search graph.ttl --text "product price"
+    python cli.py search graph.ttl --sparql query.rq
+"""
+
+import argparse
+import sys
+
+DEFAULT_NAMESPACE = "http://example.org/"
+
+
+def _load_graph(path, namespace):
+    from rdflib import Graph, Namespace
+
+    g = Graph()
+    g.parse(path)
+    EX = Namespace(namespace)
+    g.bind("ex", EX)
+    return g, EX
+
+
+def fetch(args):
+    """Fetch and clean one webpage"""
+    from webpage_fetcher import WebpageFetcher
+
+    html_content = WebpageFetcher().fetch(args.url, timeout=args.timeout, retries=args.retries)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(html_content)
+        print(f"Saved {len(html_content)} characters to {args.output}")
+    else:
+        sys.stdout.write(html_content)
+
+
+def build(args):
+    """Build the knowledge graph of a saved HTML page"""
+    from rdflib import Graph, Namespace, RDFS
+    from rdflib.namespace import OWL
+    from knowledge_graph import KnowledgeGraph
+    from ontology_setup import Ontology
+
+    with open(args.html, encoding="utf-8") as f:
+        html_content = f.read()
+
+    g = Graph()
+    EX = Namespace(args.namespace)
+    g.bind("ex", EX)
+    g.bind("owl", OWL)
+    g.bind("rdfs", RDFS)
+    Ontology(g, EX)
+    KnowledgeGraph(g, args.namespace).build_knowledge_graph(html_content, args.url)
+    g.serialize(destination=args.output, format=args.format)
+    print(f"Knowledge graph with {len(g)} triples saved to {args.output}")
+
+
+def reason(args):
+    """Apply one reasoner to a saved knowledge graph"""
+    g, EX = _load_graph(args.graph, args.namespace)
+
+    if args.reasoner == "owl":
+        from owl_reasoner import OWLreasoner
+        OWLreasoner(g).apply_owl_reasoning()
+    elif args.reasoner == "rdfs":
+        from rdfs_reasoner import RDFSreasoner
+        RDFSreasoner(g).apply_rdfs_reasoning()
+    elif args.reasoner == "hol":
+        from HOL_reasoner import HOL
+        HOL(g, EX).apply_higher_order_logic()
+    elif args.reasoner == "ulkb":
+        from ULKB_logic_rules import ULKBrules
+        ULKBrules(g, EX).apply_universal_logic_knowledge_base()
+
+    g.serialize(destination=args.output or args.graph, format=args.format)
+    print(f"Reasoned graph saved to {args.output or args.graph}")
+
+
+def search(args):
+    """Run a semantic search or a SPARQL query on a saved knowledge graph"""
+    from sparql_query_search import QueryBasedSearch
+
+    g, EX = _load_graph(args.graph, args.namespace)
+    searcher = QueryBasedSearch(g, EX, backend=args.backend)
+
+    if args.sparql:
+        with open(args.sparql, encoding="utf-8") as f:
+            query = f.read()
+        for row in searcher.sparql_query(query, initNs={"ex": EX}):
+            print("\t".join(str(value) for value in row))
+    else:
+        for node, text, score in searcher.search_query(args.text, threshold=args.threshold)[:args.top]:
+            print(f"Node: {node}, Text: '{text}', Similarity: {score:.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one step of the scraping pipeline")
+    parser.add_argument("--namespace", default=DEFAULT_NAMESPACE)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch_parser = subparsers.add_parser("fetch", help="Fetch and clean a webpage")
+    fetch_parser.add_argument("url")
+    fetch_parser.add_argument("--output", default=None)
+    fetch_parser.add_argument("--timeout", type=int, default=30)
+    fetch_parser.add_argument("--retries", type=int, default=3)
+    fetch_parser.set_defaults(func=fetch)
+
+    build_parser = subparsers.add_parser("build", help="Build a knowledge graph from a saved page")
+    build_parser.add_argument("html")
+    build_parser.add_argument("--url", default=None)
+    build_parser.add_argument("--output", default="knowledge_graph.ttl")
+    build_parser.add_argument("--format", default="turtle")
+    build_parser.set_defaults(func=build)
+
+    reason_parser = subparsers.add_parser("reason", help="Apply a reasoner to a saved graph")
+    reason_parser.add_argument("graph")
+    reason_parser.add_argument("--reasoner", default="owl", choices=("owl", "rdfs", "hol", "ulkb"))
+    reason_parser.add_argument("--output", default=None, help="Defaults to overwriting the input graph")
+    reason_parser.add_argument("--format", default="turtle")
+    reason_parser.set_defaults(func=reason)
+
+    search_parser = subparsers.add_parser("search", help="Search a saved graph")
+    search_parser.add_argument("graph")
+    query_group = search_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("--text", help="Semantic search query")
+    query_group.add_argument("--sparql", help="File containing a SPARQL query (ex: is bound to --namespace)")
+    search_parser.add_argument("--threshold", type=float, default=0.3)
+    search_parser.add_argument("--top", type=int, default=5)
+    search_parser.add_argument("--backend", default="torch")
+    search_parser.set_defaults(func=search)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
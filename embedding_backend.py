@@ -0,0 +1,92 @@
+"""
+Module: embedding_backend.py
+Description: Implements the EmbeddingBackend class which wraps the sentence embedding model behind a selectable
+CPU inference backend (PyTorch, ONNX Runtime or int8 dynamic quantization).
+"""
+
+import os
+
+from common import logger
+from instrumentation import metrics
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+class EmbeddingBackend:
+    """
+    Class for encoding sentences with a selectable CPU inference backend.
+
+    Embeddings are always returned L2-normalised as a NumPy array, so the cosine
+    similarity of two embeddings is their dot product regardless of the backend.
+
+    @Feature Semantic Search over the Knowledge Graph
+    @Scenario Encoding text on CPU-only hosts with ONNX Runtime or int8 quantization
+    """
+
+    BACKENDS = ("torch", "onnx", "quantized")
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, backend: str = "torch",
+                 num_threads: int = None, batch_size: int = 64):
+        """
+        Initialize the EmbeddingBackend and load the model.
+
+        :param model_name: Name of the sentence-transformers model to load.
+        :param backend: One of "torch", "onnx" or "quantized" (PyTorch with int8 dynamic quantization).
+        :param num_threads: Number of intra-op CPU threads. Defaults to the number of CPUs.
+        :param batch_size: Number of sentences encoded per forward pass.
+        :raises ValueError: If the backend is not supported.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported embedding backend '{backend}', expected one of {self.BACKENDS}")
+
+        self.model_name = model_name
+        self.backend = backend
+        self.num_threads = num_threads or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.model = self._load_model()
+        logger.info(f"Loaded embedding model {model_name} with {backend} backend ({self.num_threads} threads)")
+
+    def _load_model(self):
+        """Load the sentence-transformers model for the selected backend"""
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        torch.set_num_threads(self.num_threads)
+
+        if self.backend == "onnx":
+            import onnxruntime
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = self.num_threads
+            session_options.inter_op_num_threads = 1
+            return SentenceTransformer(
+                self.model_name,
+                device="cpu",
+                backend="onnx",
+                model_kwargs={"provider": "CPUExecutionProvider", "session_options": session_options},
+            )
+
+        model = SentenceTransformer(self.model_name, device="cpu")
+        if self.backend == "quantized":
+            # Replace the Linear layers of the transformer with int8 dynamically quantized ones
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def encode(self, sentences):
+        """
+        Encode one sentence or a list of sentences.
+
+        :param sentences: A string or a list of strings.
+        :return: A float32 NumPy array of normalised embeddings (1-D for a single string, 2-D otherwise).
+        """
+        with metrics.stage("embed", backend=self.backend) as record:
+            record["sentences"] = 1 if isinstance(sentences, str) else len(sentences)
+            embeddings = self.model.encode(
+                sentences,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        metrics.increment("sentences_embedded", record["sentences"], backend=self.backend)
+        return embeddings
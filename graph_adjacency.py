@@ -0,0 +1,218 @@
+"""
+Module: graph_adjacency.py
+Description: Implements the AdjacencyIndex class which converts the URIRef-to-URIRef triples of an RDF graph into
+integer node IDs and per-predicate CSR adjacency matrices for analytics and rendering.
+"""
+
+import numpy as np
+from rdflib import URIRef
+from rdflib.store import TripleAddedEvent, TripleRemovedEvent
+
+
+class _EdgeBuffer:
+    """Growable pair of int64 arrays holding the (row, col) IDs of one predicate's edges"""
+
+    def __init__(self, capacity=1024):
+        self.rows = np.empty(capacity, dtype=np.int64)
+        self.cols = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+
+    def append(self, row, col):
+        if self.size == len(self.rows):
+            self.rows = np.resize(self.rows, 2 * self.size)
+            self.cols = np.resize(self.cols, 2 * self.size)
+        self.rows[self.size] = row
+        self.cols[self.size] = col
+        self.size += 1
+
+    def view(self):
+        """Return zero-copy views of the filled part of the buffers"""
+        return self.rows[:self.size], self.cols[:self.size]
+
+
+class AdjacencyIndex:
+    """
+    Class mapping graph nodes to integer IDs and keeping CSR adjacency arrays per predicate.
+
+    Nodes are numbered once, in the order they are first seen. Edges are appended to NumPy
+    buffers as triples are added to the store, and CSR matrices are rebuilt from those buffers
+    (vectorised, without touching the RDF store) only when they are requested after a change.
+    Removals, which rdflib's in-memory store does not announce, are detected from the size of
+    the graph and trigger a full rebuild.
+
+    @Feature Knowledge Graph Analytics
+    @Scenario Computing centrality and rendering the graph from compact NumPy structures
+    """
+
+    def __init__(self, graph):
+        """
+        Initialize the AdjacencyIndex, convert the triples already in the graph and subscribe to changes.
+
+        :param graph: The rdflib Graph to convert.
+        """
+        self.g = graph
+        self.rebuild()
+
+        self.g.store.dispatcher.subscribe(TripleAddedEvent, self._on_triple_added)
+        self.g.store.dispatcher.subscribe(TripleRemovedEvent, self._on_triple_removed)
+
+    @classmethod
+    def for_graph(cls, graph):
+        """
+        Return the adjacency index shared by every component working on a graph, creating it on first use.
+
+        Like GraphIndex.for_graph: each index stays subscribed to the store, so there should be one per graph.
+        """
+        adjacency = getattr(graph, "_adjacency_index", None)
+        if adjacency is None:
+            adjacency = graph._adjacency_index = cls(graph)
+        return adjacency
+
+    def rebuild(self):
+        """Rebuild the node numbering and edge buffers from the triples currently in the graph"""
+        self._node_ids = {}
+        self._nodes = []
+        self._predicate_ids = {}
+        self.predicates = []
+        self._buffers = []
+        self._csr_cache = {}
+        self._stale = False
+        self._expected_len = len(self.g)
+
+        for s, p, o in self.g:
+            self._add_edge(s, p, o)
+
+    def _ensure_fresh(self):
+        if self._stale or len(self.g) != self._expected_len:
+            self.rebuild()
+
+    def _on_triple_added(self, event):
+        # Fired before the insert, and also for triples the store already holds
+        if event.triple in self.g:
+            return
+        self._expected_len += 1
+        s, p, o = event.triple
+        self._add_edge(s, p, o)
+
+    def _on_triple_removed(self, event):
+        # Edge buffers are append-only; rebuild lazily on the next request
+        self._stale = True
+
+    @property
+    def nodes(self):
+        """List of nodes, indexed by their integer ID"""
+        self._ensure_fresh()
+        return self._nodes
+
+    def node_id(self, node):
+        """Return the integer ID of a node, assigning a new one if it has not been seen"""
+        node_id = self._node_ids.get(node)
+        if node_id is None:
+            node_id = len(self._nodes)
+            self._node_ids[node] = node_id
+            self._nodes.append(node)
+        return node_id
+
+    def _add_edge(self, s, p, o):
+        if not (isinstance(s, URIRef) and isinstance(o, URIRef)):
+            return
+        predicate_id = self._predicate_ids.get(p)
+        if predicate_id is None:
+            predicate_id = len(self.predicates)
+            self._predicate_ids[p] = predicate_id
+            self.predicates.append(p)
+            self._buffers.append(_EdgeBuffer())
+        self._buffers[predicate_id].append(self.node_id(s), self.node_id(o))
+        if self._csr_cache:
+            self._csr_cache.clear()
+
+    def csr(self, predicate=None, symmetric=False):
+        """
+        Return the CSR adjacency matrix of one predicate, or of all predicates combined.
+
+        :param predicate: The predicate URIRef, or None for every URIRef-to-URIRef edge.
+        :param symmetric: If True, return the undirected (symmetrised) adjacency.
+        :return: A scipy.sparse.csr_matrix of shape (n, n) with 1.0 for each edge.
+        """
+        self._ensure_fresh()
+        key = (predicate, symmetric)
+        matrix = self._csr_cache.get(key)
+        if matrix is not None:
+            return matrix
+
+        if predicate is None:
+            buffers = self._buffers
+        elif predicate in self._predicate_ids:
+            buffers = [self._buffers[self._predicate_ids[predicate]]]
+        else:
+            buffers = []
+
+        n = len(self._nodes)
+        rows = np.concatenate([buffer.view()[0] for buffer in buffers]) if buffers else np.empty(0, dtype=np.int64)
+        cols = np.concatenate([buffer.view()[1] for buffer in buffers]) if buffers else np.empty(0, dtype=np.int64)
+        if symmetric:
+            rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+
+        from scipy import sparse
+        matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+        # Re-adding an existing triple (or symmetrising) produces duplicate entries; keep plain 0/1 adjacency
+        matrix.data[:] = 1.0
+        self._csr_cache[key] = matrix
+        return matrix
+
+    def undirected_edges(self):
+        """
+        Return every node pair joined by an edge, once per pair.
+
+        :return: (sources, targets, predicate_ids) int arrays, with sources <= targets. When several
+            predicates join the same pair, the one registered last in self.predicates is kept.
+        """
+        self._ensure_fresh()
+        n = len(self._nodes)
+        sources, targets, predicate_ids = [], [], []
+        for predicate_id, buffer in enumerate(self._buffers):
+            rows, cols = buffer.view()
+            sources.append(np.minimum(rows, cols))
+            targets.append(np.maximum(rows, cols))
+            predicate_ids.append(np.full(buffer.size, predicate_id, dtype=np.int64))
+        if not sources:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+        predicate_ids = np.concatenate(predicate_ids)
+        # Keep the last occurrence of each pair: unique over the reversed edge list
+        keys = (sources * n + targets)[::-1]
+        _, first = np.unique(keys, return_index=True)
+        last = len(keys) - 1 - first
+        return sources[last], targets[last], predicate_ids[last]
+
+    def tree_parents(self, predicate):
+        """
+        Return, for every node, its direct parent along a containment-like predicate.
+
+        Reasoners add shortcut edges from ancestors to descendants next to the builder's own edges,
+        and a rebuild refills the edge buffers in store order, so neither the first nor the last edge
+        into a node is reliably its parent. An edge a -> v is dropped as a shortcut when a -> c -> v
+        for some other node c; what is left is the deepest source of v, i.e. its structural parent.
+
+        :param predicate: The predicate URIRef, e.g. EX.contains.
+        :return: An int64 array of length n holding the parent ID of each node, or -1 for none. A node
+            with several structural parents (e.g. a shared template) gets the one with the lowest ID.
+        """
+        self._ensure_fresh()
+        parents = np.full(len(self._nodes), -1, dtype=np.int64)
+        if predicate not in self._predicate_ids:
+            return parents
+        adjacency = self.csr(predicate).copy()
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+
+        two_step = adjacency @ adjacency
+        direct = (adjacency - adjacency.multiply(two_step > 0)).tocoo()
+        direct_rows, direct_cols = direct.row[direct.data > 0], direct.col[direct.data > 0]
+        # Reverse so that, of several parents, the lowest-ID one is written last and kept
+        order = np.lexsort((direct_rows, direct_cols))[::-1]
+        parents[direct_cols[order]] = direct_rows[order]
+        return parents
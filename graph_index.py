@@ -0,0 +1,228 @@
+"""
+Module: graph_index.py
+Description: Implements the GraphIndex class which keeps predicate-aware side indexes (tag, class, text, type and
+containment) over an RDF graph, so hot lookups do not scan triple patterns across the whole store.
+"""
+
+from collections import Counter
+
+from rdflib import RDF, RDFS
+from rdflib.store import TripleAddedEvent, TripleRemovedEvent
+
+
+class GraphIndex:
+    """
+    Class maintaining typed secondary indexes over the knowledge graph.
+
+    The index subscribes to the store's add events, so it stays consistent with every triple
+    written to the graph, whether it comes from the KnowledgeGraph builder or a reasoner.
+    rdflib's in-memory store does not announce removals, so each lookup also compares the size
+    of the graph with the number of additions seen and rebuilds the index on a mismatch.
+    Each index is a dict of insertion-ordered dicts, giving O(1) lookups in both directions.
+
+    @Feature Knowledge Graph Construction
+    @Scenario Looking up elements by tag, class, text or type without scanning the store
+    """
+
+    def __init__(self, graph, EX):
+        """
+        Initialize the GraphIndex, index the triples already in the graph and subscribe to changes.
+
+        :param graph: The rdflib Graph to index.
+        :param EX: The namespace used for the HTML element predicates.
+        """
+        self.g = graph
+        self.EX = EX
+        self._generation = 0
+        # Number of new (not duplicate) triples added per predicate since the index was created
+        self.additions = Counter()
+
+        self._handlers = {
+            EX.hasTag: (self._add_tag, self._remove_tag),
+            EX.hasClass: (self._add_class, self._remove_class),
+            EX.hasText: (self._add_text, self._remove_text),
+            EX.contains: (self._add_contains, self._remove_contains),
+            RDF.type: (self._add_type, self._remove_type),
+            RDFS.subClassOf: (self._class_hierarchy_changed, self._class_hierarchy_changed),
+        }
+        self.rebuild()
+
+        self.g.store.dispatcher.subscribe(TripleAddedEvent, self._on_triple_added)
+        self.g.store.dispatcher.subscribe(TripleRemovedEvent, self._on_triple_removed)
+
+    @classmethod
+    def for_graph(cls, graph, EX):
+        """
+        Return the index shared by every component working on a graph, creating it on first use.
+
+        Each index scans the whole graph and stays subscribed to its store (rdflib has no way to
+        unsubscribe), so components should share one index per graph instead of building their own.
+        """
+        indexes = getattr(graph, "_graph_indexes", None)
+        if indexes is None:
+            indexes = graph._graph_indexes = {}
+        index = indexes.get(str(EX))
+        if index is None:
+            index = indexes[str(EX)] = cls(graph, EX)
+        return index
+
+    def rebuild(self):
+        """Rebuild every index from the triples currently in the graph"""
+        self._tag_elements = {}
+        self._element_tag = {}
+        self._class_elements = {}
+        self._element_text = {}
+        self._element_types = {}
+        self._contains = {}
+        self._type_depth = {}
+        self._stale = False
+        self._generation += 1
+        self._expected_len = len(self.g)
+
+        for predicate, (add, _) in self._handlers.items():
+            for s, o in self.g.subject_objects(predicate):
+                add(s, o)
+
+    def _ensure_fresh(self):
+        """Rebuild lazily after a removal that could not be applied incrementally"""
+        if self._stale or len(self.g) != self._expected_len:
+            self.rebuild()
+
+    @property
+    def generation(self):
+        """Counter that moves on whenever the graph changes; lets callers invalidate derived caches"""
+        self._ensure_fresh()
+        return self._generation
+
+    def _on_triple_added(self, event):
+        # The store announces every add, including triples it already holds; the event fires before the insert
+        if event.triple in self.g:
+            return
+        self._generation += 1
+        self._expected_len += 1
+        s, p, o = event.triple
+        self.additions[p] += 1
+        handlers = self._handlers.get(p)
+        if handlers is not None:
+            handlers[0](s, o)
+
+    def _on_triple_removed(self, event):
+        # Only stores that announce removals get here; the in-memory store is caught by _ensure_fresh
+        self._generation += 1
+        s, p, o = event.triple
+        if s is None or p is None or o is None:
+            self._stale = True
+            return
+        self._expected_len -= 1
+        handlers = self._handlers.get(p)
+        if handlers is not None:
+            handlers[1](s, o)
+
+    # Index maintenance
+
+    def _add_tag(self, element, tag):
+        self._tag_elements.setdefault(str(tag), {})[element] = None
+        self._element_tag[element] = str(tag)
+
+    def _remove_tag(self, element, tag):
+        self._tag_elements.get(str(tag), {}).pop(element, None)
+        if self._element_tag.get(element) == str(tag):
+            del self._element_tag[element]
+
+    def _add_class(self, element, cls):
+        self._class_elements.setdefault(str(cls), {})[element] = None
+
+    def _remove_class(self, element, cls):
+        self._class_elements.get(str(cls), {}).pop(element, None)
+
+    def _add_text(self, element, text):
+        # Multi-valued: elements sharing an id share a URI, and each keeps its own text
+        self._element_text.setdefault(element, {})[text] = None
+
+    def _remove_text(self, element, text):
+        self._element_text.get(element, {}).pop(text, None)
+
+    def _add_type(self, element, element_type):
+        self._element_types.setdefault(element, {})[element_type] = None
+
+    def _remove_type(self, element, element_type):
+        self._element_types.get(element, {}).pop(element_type, None)
+
+    def _class_hierarchy_changed(self, subclass, superclass):
+        self._type_depth = {}
+
+    def _add_contains(self, container, element):
+        self._contains.setdefault(container, {})[element] = None
+
+    def _remove_contains(self, container, element):
+        self._contains.get(container, {}).pop(element, None)
+
+    # Lookups
+
+    def elements_with_tag(self, tag):
+        """Return the elements with the given tag name"""
+        self._ensure_fresh()
+        return list(self._tag_elements.get(str(tag), ()))
+
+    def tag_of(self, element):
+        """Return the tag name of an element, or None"""
+        self._ensure_fresh()
+        return self._element_tag.get(element)
+
+    def elements_with_class(self, cls):
+        """Return the elements carrying the given CSS class"""
+        self._ensure_fresh()
+        return list(self._class_elements.get(str(cls), ()))
+
+    def class_groups(self):
+        """Return a dict mapping each CSS class to the list of elements carrying it"""
+        self._ensure_fresh()
+        return {cls: list(elements) for cls, elements in self._class_elements.items() if elements}
+
+    def text_of(self, element):
+        """Return the first hasText literal of an element, or None"""
+        self._ensure_fresh()
+        texts = self._element_text.get(element)
+        return next(iter(texts), None) if texts else None
+
+    def texts(self):
+        """Return a list of (element, text literal) pairs, one for every ex:hasText triple"""
+        self._ensure_fresh()
+        return [(element, text) for element, texts in self._element_text.items() for text in texts]
+
+    def _type_depth_of(self, element_type):
+        """Number of (transitive) superclasses of a class, cached until the class hierarchy changes"""
+        depth = self._type_depth.get(element_type)
+        if depth is None:
+            depth = sum(1 for cls in self.g.transitive_objects(element_type, RDFS.subClassOf) if cls != element_type)
+            self._type_depth[element_type] = depth
+        return depth
+
+    def type_of(self, element):
+        """
+        Return the most specific rdf:type of an element, or None.
+
+        Once inferred types exist an element has several (e.g. ex:TextElement and ex:Element), and
+        their order after a rebuild follows the store, so the type with the most superclasses is
+        picked; ties go to the type seen first.
+        """
+        self._ensure_fresh()
+        types = self._element_types.get(element)
+        if not types:
+            return None
+        return max(types, key=self._type_depth_of)
+
+    def types_of(self, element):
+        """Return every rdf:type of an element, asserted and inferred"""
+        self._ensure_fresh()
+        return list(self._element_types.get(element, ()))
+
+    def contained_in(self, container):
+        """Return the elements directly contained in the given element"""
+        self._ensure_fresh()
+        return list(self._contains.get(container, ()))
+
+    def containment_pairs(self):
+        """Return a list of (container, element) pairs for every ex:contains triple"""
+        self._ensure_fresh()
+        return [(container, element) for container, elements in self._contains.items() for element in elements]
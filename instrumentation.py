@@ -0,0 +1,222 @@
+"""
+Module: instrumentation.py
+Description: Contains the Metrics class used to time, count and memory-profile every pipeline stage, and the shared
+metrics instance the other modules report to. Metrics can be exported as JSON lines or Prometheus text format.
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Collector for per-stage timings, counters and peak memory.
+
+    Collection is off by default, so instrumented code costs one attribute check per stage.
+    Call enable() to start recording; stage() records wall and CPU time for a block, and
+    optionally its peak traced memory (tracemalloc) and a cProfile dump.
+
+    tracemalloc keeps a single peak for the whole process, so peak_bytes is only recorded for
+    stages on the main thread, and includes whatever other threads allocate meanwhile; it is
+    exact only while the main thread is the one doing the work. Stages on other threads (such
+    as the batch pipeline's fetch threads) get no peak_bytes and never reset the peak.
+
+    @Feature Pipeline Instrumentation
+    @Scenario Finding regressions and hot spots from per-stage metrics
+    """
+
+    def __init__(self):
+        """Initialize an empty, disabled collector."""
+        self.enabled = False
+        self.trace_memory = False
+        self.profile_dir = None
+        self.records = []
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, trace_memory=False, profile_dir=None):
+        """
+        Start recording metrics.
+
+        :param trace_memory: Record the peak traced memory of each stage with tracemalloc (slows Python code down).
+        :param profile_dir: If set, dump a cProfile of each top-level stage into this directory.
+        """
+        self.enabled = True
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def disable(self):
+        """Stop recording metrics (already collected metrics are kept)."""
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self):
+        """Drop every collected record and counter."""
+        with self._lock:
+            self.records = []
+            self.counters = {}
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """
+        Time a block of code as one stage.
+
+        Yields a dict that the block can fill with extra values (bytes, triple counts, ...),
+        which are stored with the record.
+
+        :param name: Stage name, e.g. "fetch.navigate" or "reason.owl".
+        :param labels: Extra labels stored with the record (e.g. url).
+        """
+        record = {"stage": name, **labels}
+        if not self.enabled:
+            yield record
+            return
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        profiler = None
+        if self.profile_dir and not stack:
+            profiler = cProfile.Profile()
+        track_peak = self.trace_memory and threading.current_thread() is threading.main_thread()
+        if track_peak:
+            tracemalloc.reset_peak()
+        record["_child_peak"] = 0
+        stack.append(record)
+
+        start, cpu_start = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record["seconds"] = time.perf_counter() - start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            record["timestamp"] = time.time()
+            stack.pop()
+
+            child_peak = record.pop("_child_peak")
+            if track_peak:
+                # A nested stage resets the peak, so fold the children's peaks back in
+                record["peak_bytes"] = max(tracemalloc.get_traced_memory()[1], child_peak)
+                if stack:
+                    stack[-1]["_child_peak"] = max(stack[-1]["_child_peak"], record["peak_bytes"])
+            if profiler:
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{name}-{int(record['timestamp'] * 1000)}.prof"))
+
+            with self._lock:
+                self.records.append(record)
+
+    def increment(self, name, value=1, **labels):
+        """
+        Add to a counter.
+
+        :param name: Counter name, e.g. "fetch_bytes".
+        :param value: Amount to add.
+        :param labels: Labels distinguishing series of the same counter.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def drain(self):
+        """Return and clear the collected records and counters, e.g. to ship them from a worker process."""
+        with self._lock:
+            records, counters = self.records, self.counters
+            self.records, self.counters = [], {}
+        return records, counters
+
+    def merge(self, records, counters):
+        """Add records and counters drained from another Metrics instance."""
+        with self._lock:
+            self.records.extend(records)
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def export_jsonl(self, path):
+        """
+        Append every stage record and the counters to a JSON lines file.
+
+        :param path: Output file path.
+        """
+        with self._lock:
+            records = list(self.records)
+            counters = dict(self.counters)
+        with open(path, "a") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+            for (name, labels), value in counters.items():
+                f.write(json.dumps({"counter": name, "value": value, **dict(labels)}, default=str) + "\n")
+
+    def to_prometheus(self):
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Stages become summaries of wall time (sum and count) plus a gauge of the peak memory;
+        counters are exposed as pipeline_<name>_total.
+
+        :return: The exposition text.
+        """
+        with self._lock:
+            records = list(self.records)
+            counters = dict(self.counters)
+
+        seconds, counts, peaks = {}, {}, {}
+        for record in records:
+            stage = record["stage"]
+            seconds[stage] = seconds.get(stage, 0.0) + record["seconds"]
+            counts[stage] = counts.get(stage, 0) + 1
+            if "peak_bytes" in record:
+                peaks[stage] = max(peaks.get(stage, 0), record["peak_bytes"])
+
+        lines = ["# TYPE pipeline_stage_seconds summary"]
+        for stage in seconds:
+            lines.append(f'pipeline_stage_seconds_sum{{stage="{stage}"}} {seconds[stage]:.6f}')
+            lines.append(f'pipeline_stage_seconds_count{{stage="{stage}"}} {counts[stage]}')
+        if peaks:
+            lines.append("# TYPE pipeline_stage_peak_bytes gauge")
+            for stage, peak in peaks.items():
+                lines.append(f'pipeline_stage_peak_bytes{{stage="{stage}"}} {peak}')
+
+        declared = set()
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"pipeline_{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+            lines.append(f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path):
+        """
+        Write the metrics to a file in the Prometheus text format (e.g. for the node exporter textfile collector).
+
+        :param path: Output file path.
+        """
+        with open(path, "w") as f:
+            f.write(self.to_prometheus())
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared collector that all modules report to.
+metrics = Metrics()
@@ -1,11 +1,18 @@
 from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS
 from rdflib.namespace import OWL, XSD
-from bs4 import BeautifulSoup
+import hashlib
+import math
 import uuid
-import networkx as nx
+
+from graph_index import GraphIndex
+from instrumentation import metrics
+
+# Tags whose subtrees are usually site-wide boilerplate, repeated verbatim on every page of a site
+TEMPLATE_TAGS = ('header', 'nav', 'footer', 'aside')
 
 class KnowledgeGraph:
-    def __init__(self, graph, namespace):
+    def __init__(self, graph, namespace, scope="", share_templates=False, seen_templates=None,
+                 min_template_elements=3):
             # Initialize RDF graph
             self.g = graph
             self.EX = Namespace(namespace)
@@ -13,6 +20,30 @@ class KnowledgeGraph:
             
             # Set up namespaces
             self.counter = 1
+            # Prefix for element URIs, keeps pages built separately apart when merged into one store
+            self.scope = scope
+
+            # Template sharing: identical header/nav/footer/aside subtrees get content-addressed URIs,
+            # so they are stored once however many pages use them. seen_templates holds the fingerprints
+            # already in the store (or in another process' output) whose triples need not be re-emitted.
+            self.share_templates = share_templates
+            self.seen_templates = seen_templates if seen_templates is not None else set()
+            self.min_template_elements = min_template_elements
+            self._in_template = False
+
+            # Side indexes for hot lookups (tag, class, text, type), kept up to date as triples are added
+            self.index = GraphIndex.for_graph(self.g, self.EX)
+
+            # Created on first use, so building and reasoning do not pay for NumPy/SciPy
+            self._adjacency = None
+
+    @property
+    def adjacency(self):
+        """Integer node IDs and per-predicate CSR adjacency for analytics and rendering"""
+        if self._adjacency is None:
+            from graph_adjacency import AdjacencyIndex
+            self._adjacency = AdjacencyIndex.for_graph(self.g)
+        return self._adjacency
 
     def _determine_element_type(self, element):
         """Determine the type of HTML element based on its tag and attributes"""
@@ -43,10 +74,10 @@ class KnowledgeGraph:
         
         # Try to use ID if available
         if element.get('id'):
-            return self.EX[f"{element.name}_{element.get('id')}"]
+            return self.EX[f"{self.scope}{element.name}_{element.get('id')}"]
         
         # Or use a unique counter
-        return self.EX[f"element_{self.counter}_{element.name}"]
+        return self.EX[f"{self.scope}element_{self.counter}_{element.name}"]
     
     def build_knowledge_graph(self, html_content, url=None):
         """Build a knowledge graph from HTML content with text relationships"""
@@ -54,14 +85,29 @@ class KnowledgeGraph:
             return None
         
         # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Add page metadata
-        page_uri = self._add_page_metadata(soup, url)
-        
-        # Process HTML structure recursively
-        if soup.html:
-            self._process_element(soup.html, parent_uri=page_uri)
+        from bs4 import BeautifulSoup
+        with metrics.stage("parse", url=url) as record:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            if metrics.enabled:
+                record["bytes"] = len(html_content.encode('utf-8'))
+        
+        with metrics.stage("graph_build", url=url) as record:
+            # Per-predicate counts of new triples come from the index's add events, not from scanning the store
+            before = self.index.additions.copy() if metrics.enabled else None
+            
+            # Add page metadata
+            page_uri = self._add_page_metadata(soup, url)
+            
+            # Process HTML structure recursively
+            if soup.html:
+                self._process_element(soup.html, parent_uri=page_uri)
+            
+            if metrics.enabled:
+                added = self.index.additions - before
+                record["triples"] = sum(added.values())
+                record["triples_by_predicate"] = {str(p): count for p, count in added.items()}
+                for p, count in added.items():
+                    metrics.increment("triples_built", count, predicate=str(p))
             
         return self.g
 
@@ -121,6 +167,7 @@ class KnowledgeGraph:
             self.g.add((node_uri, self.EX.hasTextContent, text_node))
             
             # Add semantic text chunks
+            from nltk.tokenize import sent_tokenize
             for idx, sentence in enumerate(sent_tokenize(text_content)):
                 # Fixed URI creation
                 sentence_node = URIRef(f"{self.EX}sentence_{uuid.uuid4()}")
@@ -139,14 +186,77 @@ class KnowledgeGraph:
         if relation == "siblingOf":
             self.g.add((target, self.EX.siblingOf, source))
     
-    def _process_element(self, element, parent_uri):
+    def _fingerprint(self, element, parts):
+        """Append a canonical form of an element subtree to parts and return its number of elements"""
+        attrs = sorted((attr, ' '.join(value) if isinstance(value, list) else value)
+                       for attr, value in element.attrs.items())
+        parts.append(f"<{element.name} {attrs!r}>")
+        size = 1
+        for child in element.children:
+            if child.name is not None:
+                size += self._fingerprint(child, parts)
+            elif child.strip():
+                parts.append(repr(child.strip()))
+        parts.append(f"</{element.name}>")
+        return size
+
+    def _process_template(self, element, parent_uri):
+        """
+        Add a boilerplate subtree as a shared template and link it to its parent.
+
+        The template's URIs are derived from a hash of the subtree, so the same header or footer
+        maps to the same nodes on every page. Its triples are only emitted the first time; later
+        pages just add the link from their own parent. Returns None if the subtree is too small
+        to be worth sharing.
+        """
+        parts = []
+        if self._fingerprint(element, parts) < self.min_template_elements:
+            return None
+        fingerprint = hashlib.sha1(''.join(parts).encode('utf-8')).hexdigest()[:16]
+        template_uri = self.EX[f"template_{fingerprint}"]
+        
+        if fingerprint in self.seen_templates or (template_uri, RDF.type, self.EX.TemplateFragment) in self.g:
+            metrics.increment("templates", status="reused", tag=element.name)
+        else:
+            metrics.increment("templates", status="built", tag=element.name)
+            # Number the template's elements from its own scope and counter, so the URIs depend on its content only
+            scope, counter = self.scope, self.counter
+            self.scope, self.counter, self._in_template = f"template_{fingerprint}_", 0, True
+            try:
+                self._process_element(element, None, element_uri=template_uri)
+            finally:
+                self.scope, self.counter, self._in_template = scope, counter, False
+            self.g.add((template_uri, RDF.type, self.EX.TemplateFragment))
+        self.seen_templates.add(fingerprint)
+        
+        if parent_uri is not None:
+            self._link_to_parent(parent_uri, template_uri)
+        return template_uri
+
+    def _link_to_parent(self, parent_uri, element_uri):
+        """Add the parent-child and containment relationships between two elements"""
+        self.g.add((parent_uri, self.EX.hasChild, element_uri))
+        self.g.add((element_uri, self.EX.isChildOf, parent_uri))
+        
+        # Add containment relationship
+        self.g.add((parent_uri, self.EX.contains, element_uri))
+        self.g.add((element_uri, self.EX.isContainedIn, parent_uri))
+
+    def _process_element(self, element, parent_uri, element_uri=None):
         """Recursively process HTML elements and add them to the graph"""
         # Skip comment nodes
         if element.name is None:
             return None
         
+        # Boilerplate subtrees are stored once and shared between pages
+        if self.share_templates and not self._in_template and element.name in TEMPLATE_TAGS:
+            template_uri = self._process_template(element, parent_uri)
+            if template_uri is not None:
+                return template_uri
+        
         # Generate URI for this element
-        element_uri = self._generate_uri_for_element(element)
+        if element_uri is None:
+            element_uri = self._generate_uri_for_element(element)
         
         # Add element type
         element_type = self._determine_element_type(element)
@@ -178,12 +288,7 @@ class KnowledgeGraph:
         
         # Add parent-child relationship
         if parent_uri is not None:
-            self.g.add((parent_uri, self.EX.hasChild, element_uri))
-            self.g.add((element_uri, self.EX.isChildOf, parent_uri))
-            
-            # Add containment relationship
-            self.g.add((parent_uri, self.EX.contains, element_uri))
-            self.g.add((element_uri, self.EX.isContainedIn, parent_uri))
+            self._link_to_parent(parent_uri, element_uri)
         
         # Process child elements
         child_uris = []
@@ -193,7 +298,8 @@ class KnowledgeGraph:
                 if child_uri:
                     child_uris.append(child_uri)
         
-        # Add sibling relationships
+        # Add sibling relationships; a repeated shared template (or a repeated id) yields the same URI twice
+        child_uris = list(dict.fromkeys(child_uris))
         for i, uri1 in enumerate(child_uris):
             for uri2 in child_uris[i+1:]:
                 self.g.add((uri1, self.EX.hasSibling, uri2))
@@ -201,31 +307,133 @@ class KnowledgeGraph:
         
         return element_uri
     
-    def compute_centrality(self):
-        """Compute centrality measures and add them to the graph"""
+    def compute_centrality(self, mode="exact", epsilon=0.05, delta=0.1, k=None, tol=1e-6,
+                           alpha=0.85, max_iter=100, seed=None, write_back=True):
+        """
+        Compute centrality measures and add them to the graph
+
+        mode="exact" runs the exact networkx algorithms. mode="approximate" estimates betweenness
+        from k sampled source nodes and computes PageRank by sparse power iteration on a CSR matrix.
+        Unless k is given, it is derived from the error bound: each normalised betweenness score is
+        within epsilon of the exact value with probability 1 - delta (Hoeffding bound). PageRank
+        iterates until the L1 change per node drops below tol.
+
+        Returns self.adjacency. With write_back=False the scores are not added as triples;
+        (nodes, scores) is returned instead, where scores maps "degree", "betweenness" and
+        "pagerank" to arrays aligned with nodes.
+        """
+        import numpy as np
+        
         print("Computing centrality measures...")
         
-        # Convert RDF graph to NetworkX graph
-        nx_graph = nx.Graph()
-        for s, p, o in self.g:
-            if isinstance(s, URIRef) and isinstance(o, URIRef):
-                nx_graph.add_edge(s, o, type=p)
+        # Undirected adjacency over integer node IDs, maintained incrementally by self.adjacency
+        nodes = list(self.adjacency.nodes)
+        n = len(nodes)
+        adjacency = self.adjacency.csr(symmetric=True)
         
         # Compute various centrality measures
-        degree_centrality = nx.degree_centrality(nx_graph)
-        betweenness_centrality = nx.betweenness_centrality(nx_graph)
-        # print(f"The Degree of centrality of the Graph is : {degree_centrality}")
-        # print(f"The betweenness centrality of the Graph is : {betweenness_centrality}")
-        pagerank = nx.pagerank(nx_graph)
+        if mode == "exact":
+            import networkx as nx
+            # networkx works on the integer IDs, so scores line up with nodes by position
+            nx_graph = nx.from_scipy_sparse_array(adjacency)
+            degree_centrality = nx.degree_centrality(nx_graph)
+            betweenness_centrality = nx.betweenness_centrality(nx_graph)
+            pagerank = nx.pagerank(nx_graph)
+            scores = {
+                "degree": np.array([degree_centrality[i] for i in range(n)]),
+                "betweenness": np.array([betweenness_centrality[i] for i in range(n)]),
+                "pagerank": np.array([pagerank[i] for i in range(n)]),
+            }
+        elif mode == "approximate":
+            degrees = np.diff(adjacency.indptr)
+            if k is None:
+                k = math.ceil(math.log(2 * max(n, 1) / delta) / (2 * epsilon ** 2))
+            k = min(k, n)
+            print(f"Approximating betweenness from {k} of {n} source nodes...")
+            scores = {
+                "degree": degrees / (n - 1) if n > 1 else np.ones(n),
+                "betweenness": self._sampled_betweenness(adjacency, k, seed),
+                "pagerank": self._sparse_pagerank(adjacency, alpha, tol, max_iter),
+            }
+        else:
+            raise ValueError(f"Unknown centrality mode '{mode}', expected 'exact' or 'approximate'")
+        
+        if not write_back:
+            return nodes, scores
         
         # Add centrality scores to the graph
-        for node, score in degree_centrality.items():
-            self.g.add((node, self.EX.hasCentralityScore, Literal(score, datatype=XSD.float)))
+        for predicate, key in ((self.EX.hasCentralityScore, "degree"),
+                               (self.EX.hasBetweennessCentrality, "betweenness"),
+                               (self.EX.hasPageRank, "pagerank")):
+            for node, score in zip(nodes, scores[key]):
+                self.g.add((node, predicate, Literal(float(score), datatype=XSD.float)))
         
-        for node, score in betweenness_centrality.items():
-            self.g.add((node, self.EX.hasBetweennessCentrality, Literal(score, datatype=XSD.float)))
-        
-        for node, score in pagerank.items():
-            self.g.add((node, self.EX.hasPageRank, Literal(score, datatype=XSD.float)))
-        
-        return nx_graph
\ No newline at end of file
+        return self.adjacency
+
+    def _sampled_betweenness(self, adjacency, k, seed=None, chunk_size=64):
+        """
+        Betweenness from k sampled source nodes (Brandes) on a symmetric CSR adjacency matrix
+
+        BFS distances come from scipy.sparse.csgraph. Shortest-path counts and dependencies are
+        then propagated level by level with sparse-dense products, for chunk_size sources at a
+        time. Scores are normalised like networkx's betweenness_centrality(k=k).
+        """
+        import numpy as np
+        from scipy.sparse import csgraph
+        
+        n = adjacency.shape[0]
+        betweenness = np.zeros(n)
+        if n < 3 or k == 0:
+            return betweenness
+        sources = np.random.default_rng(seed).choice(n, size=k, replace=False)
+        
+        for start in range(0, k, chunk_size):
+            chunk = sources[start:start + chunk_size]
+            columns = np.arange(len(chunk))
+            # One column per source: BFS level of every node, -1 where unreachable
+            distances = csgraph.shortest_path(adjacency, unweighted=True, indices=chunk).T
+            distances[np.isinf(distances)] = -1
+            distances = distances.astype(np.int64)
+            depth = int(distances.max())
+            
+            # Number of shortest paths from the source, accumulated outwards level by level
+            sigma = np.zeros(distances.shape)
+            sigma[chunk, columns] = 1.0
+            for level in range(1, depth + 1):
+                at_level = distances == level
+                sigma[at_level] = (adjacency @ np.where(distances == level - 1, sigma, 0.0))[at_level]
+            
+            # Dependencies, accumulated back inwards; the source itself (level 0) gets none
+            dependency = np.zeros(distances.shape)
+            for level in range(depth - 1, 0, -1):
+                at_level = distances == level
+                coefficient = np.where(distances == level + 1, (1.0 + dependency) / np.maximum(sigma, 1.0), 0.0)
+                dependency[at_level] = (sigma * (adjacency @ coefficient))[at_level]
+            betweenness += dependency.sum(axis=1)
+        
+        # Each sampled source only counts paths to the other n - 1 nodes, hence its separate scale
+        scale = np.full(n, 1.0 / (k * (n - 2)))
+        scale[sources] = 1.0 / ((k - 1) * (n - 2)) if k > 1 else 0.0
+        return betweenness * scale
+
+    def _sparse_pagerank(self, adjacency, alpha=0.85, tol=1e-6, max_iter=100):
+        """PageRank by power iteration on a CSR adjacency matrix (same convergence test as networkx)"""
+        import numpy as np
+        
+        n = adjacency.shape[0]
+        if n == 0:
+            return np.zeros(0)
+        
+        out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+        dangling = out_degree == 0
+        inv_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        transposed = adjacency.T.tocsr()
+        
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = x
+            x = alpha * (transposed @ (previous * inv_degree) + previous[dangling].sum() / n) + (1 - alpha) / n
+            if np.abs(x - previous).sum() < n * tol:
+                return x
+        print(f"PageRank did not converge within {max_iter} iterations")
+        return x
@@ -1,15 +1,5 @@
-from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS
-from rdflib.namespace import OWL, XSD
-from owlrl import DeductiveClosure, OWLRL_Semantics, RDFS_Semantics
-from bs4 import BeautifulSoup, Tag
-import networkx as nx
-from nltk.tokenize import sent_tokenize
-from sentence_transformers import SentenceTransformer, util
-import requests
-import os
-import re
-# from pyvis.network import Network
-import uuid
+from rdflib import Graph, Namespace, Literal, RDFS
+from rdflib.namespace import OWL
 
 from webpage_fetcher import WebpageFetcher
 from ontology_setup import Ontology
@@ -19,6 +9,17 @@ from owl_reasoner import OWLreasoner
 from rdfs_reasoner import RDFSreasoner
 from sparql_query_search import QueryBasedSearch
 from ULKB_logic_rules import ULKBrules
+from batch_pipeline import BatchPipeline
+
+# Elements whose text contains ?keyword; bind ?keyword through initBindings instead of editing the query text
+TEXT_CONTAINS_QUERY = """
+SELECT ?element ?text
+WHERE {
+?element a ?type .
+?element ex:hasText ?text .
+FILTER(CONTAINS(LCASE(?text), ?keyword))
+}
+"""
 
 class WebAgent:
     def __init__(self, base_namespace="http://example.org/"):
@@ -30,7 +31,6 @@ class WebAgent:
         self.g.bind("rdfs", RDFS)
         
         self.counter = 1
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
 
     def process_webpage(url):
         """Process a webpage and build a knowledge graph"""
@@ -60,44 +60,49 @@ class WebAgent:
         # RDFS_reasoner = RDFSreasoner(Agent.g)
         # RDFS_reasoner.apply_rdfs_reasoning()
 
-        # HOL_reasoner = HOL(Agent.g, Agent.EX)
+        # HOL_reasoner = HOL(Agent.g, Agent.EX, kg_builder.index)
         # HOL_reasoner.apply_higher_order_logic()
 
-        # ULKB_rules = ULKBrules(Agent.g, Agent.EX)
+        # ULKB_rules = ULKBrules(Agent.g, Agent.EX, kg_builder.index)
         # ULKB_rules.apply_universal_logic_knowledge_base()
         
         # calcaltion the centrality
-        # nx_graph = kg_builder.compute_centrality()
+        # adjacency = kg_builder.compute_centrality()
         
         # for visualization
-        # kg_builder.save_graph_visualization(nx_graph, "knowledge_graph_visualization1.html")
+        # visualizer = VisualizationKG(url, Agent.g, kg_builder.index, kg_builder.adjacency)
+        # visualizer.save_graph_visualization(adjacency, "knowledge_graph_visualization1.html")
+        # visualizer.save_graph_summary("knowledge_graph_summary1.json", html_filename="knowledge_graph_summary1.html")
         
         # for storing the KG
         # kg_builder.save_to_file("knowledge_graph1.ttl")
         
         print(f"Graph contains {len(Agent.g)} triples")
         print("\nPerforming  semantic search:")
-        search = QueryBasedSearch(Agent.g, Agent.EX)
+        search = QueryBasedSearch(Agent.g, Agent.EX, index=kg_builder.index)
         search_results = search.search_query("product price", threshold=0.3)
         for node, text, score in search_results[:5]:  # Show top 5 results
             print(f"Node: {node}, Text: '{text}', Similarity: {score:.3f}")
         
         print("\nPerforming example SPARQL query:")
-        sparql_query = """
-        PREFIX ex: <""" + url + """>
-        SELECT ?element ?text
-        WHERE {
-        ?element a ?type .
-        ?element ex:hasText ?text .
-        FILTER(CONTAINS(LCASE(?text), "price"))
-        }
-        """
-        results = search.sparql_query(sparql_query)
+        results = search.sparql_query(
+            TEXT_CONTAINS_QUERY,
+            initBindings={"keyword": Literal("price")},
+            initNs={"ex": Agent.EX},
+        )
         for row in results:
             print(f"Element: {row.element}, Text: {row.text}\n\n")
         
         print("\nProcessing complete!")
 
+    def process_batch(urls, reasoner="owl", share_templates=False):
+        """Process many webpages as a pipeline and merge them into one knowledge graph"""
+        pipeline = BatchPipeline(reasoner=reasoner, share_templates=share_templates)
+        results = pipeline.run(urls)
+        for result in results:
+            print(f"{result['status']}: {result['url']} ({result['triples']} triples)")
+        return pipeline.g
+
 
 if __name__ == "__main__":
     url_to_process = "https://www.amazon.com/Amazon-Essentials-Mens-Derby-Black/dp/B0BNBS1JRR/ref=sr_1_1_ffob_sspa?dib=eyJ2IjoiMSJ9.C84byVgb2mDkuzXYjKA2jDEoFGJ-3QHatSfYILE8lAuGB5XDkH-wLyb5lRsa2w5djimNlrVbF_0wx27FR1jAS_av-Iil_cVKOFEh4IEwIbjzga9m4dLSC27LHJK_qVafPW3fiKqJkeB7ELZR08ufPhh5WDwAc6j3lO69vJQLKLy8bfj39Be0LDOfRqll2p5wvv6ajDP_PLskKDXucnvQKOLg-1DILu7CYlKnk4au_5k-GkixUXjm4BdTaZHWqPV_1iYo0YjFJ15nppFpuLrSU5vX5kvebVCBQrq9gSpVAQA.Wuv3sEHChnSYqh4iNmHgj_CBs9sG6iXH5oQc5cf6xSU&dib_tag=se&keywords=Shoes&qid=1741447666&sr=8-1-spons&sp_csd=d2lkZ2V0TmFtZT1zcF9hdGY&th=1&psc=1"
@@ -15,12 +15,14 @@ class Ontology:
             self.g.add((self.EX.StructuralElement, RDF.type, OWL.Class))
             self.g.add((self.EX.LinkElement, RDF.type, OWL.Class))
             self.g.add((self.EX.FormElement, RDF.type, OWL.Class))
+            self.g.add((self.EX.TemplateFragment, RDF.type, OWL.Class))
             
             # Define subclass relationships
             self.g.add((self.EX.TextElement, RDFS.subClassOf, self.EX.Element))
             self.g.add((self.EX.StructuralElement, RDFS.subClassOf, self.EX.Element))
             self.g.add((self.EX.LinkElement, RDFS.subClassOf, self.EX.Element))
             self.g.add((self.EX.FormElement, RDFS.subClassOf, self.EX.Element))
+            self.g.add((self.EX.TemplateFragment, RDFS.subClassOf, self.EX.StructuralElement))
             
             # Define properties
             self.g.add((self.EX.hasChild, RDF.type, OWL.TransitiveProperty))
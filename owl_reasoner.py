@@ -1,5 +1,6 @@
 from rdflib.namespace import OWL
-from owlrl import DeductiveClosure, OWLRL_Semantics
+
+from instrumentation import metrics
 
 class OWLreasoner:
         def __init__(self, graph):
@@ -8,6 +9,11 @@ class OWLreasoner:
 
         def apply_owl_reasoning(self):
                 """Apply OWL-RL reasoning to the knowledge graph"""
+                from owlrl import DeductiveClosure, OWLRL_Semantics
                 print("Applying OWL-RL reasoning...")
-                DeductiveClosure(OWLRL_Semantics).expand(self.g)
+                with metrics.stage("reason.owl") as record:
+                        record["triples_before"] = len(self.g)
+                        DeductiveClosure(OWLRL_Semantics).expand(self.g)
+                        record["triples_after"] = len(self.g)
+                metrics.increment("triples_inferred", record["triples_after"] - record["triples_before"], reasoner="owl")
                 print(f"After OWL-RL reasoning, graph contains {len(self.g)} triples")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from owlrl import DeductiveClosure, RDFS_Semantics
+from instrumentation import metrics
 
 class RDFSreasoner:
         def __init__(self, graph):
@@ -7,6 +7,11 @@ class RDFSreasoner:
                                 
         def apply_rdfs_reasoning(self):
                 """Apply RDFS reasoning to the knowledge graph"""
+                from owlrl import DeductiveClosure, RDFS_Semantics
                 print("Applying RDFS reasoning...")
-                DeductiveClosure(RDFS_Semantics).expand(self.g)
+                with metrics.stage("reason.rdfs") as record:
+                        record["triples_before"] = len(self.g)
+                        DeductiveClosure(RDFS_Semantics).expand(self.g)
+                        record["triples_after"] = len(self.g)
+                metrics.increment("triples_inferred", record["triples_after"] - record["triples_before"], reasoner="rdfs")
                 print(f"After RDFS reasoning, graph contains {len(self.g)} triples")
\ No newline at end of file
@@ -1,35 +1,132 @@
+import threading
+from collections import OrderedDict
+
 from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS
 from rdflib.namespace import OWL, XSD
-import networkx as nx
-from sentence_transformers import SentenceTransformer, util
+
+from embedding_backend import EmbeddingBackend, DEFAULT_MODEL_NAME
+from graph_index import GraphIndex
+from instrumentation import metrics
 
 
 class QueryBasedSearch:
-        def __init__(self, graph, EX):
+        # Parsed and algebra-translated queries, shared by all instances since they do not depend on the graph.
+        # Kept in least-recently-used order and capped, so query text built by string splicing cannot grow it forever
+        _prepared_queries = OrderedDict()
+        _prepared_lock = threading.Lock()
+        MAX_PREPARED_QUERIES = 256
+        # Result sets memoized per instance, in least-recently-used order
+        MAX_CACHED_RESULTS = 128
+
+        def __init__(self, graph, EX, backend="torch", num_threads=None, batch_size=64, index=None, embedder=None):
                 # Initialize RDF graph
                 self.g = graph
                 self.EX = EX
+                self.index = index if index is not None else GraphIndex.for_graph(graph, EX)
 
-                # Initialize sentence transformer model for semantic search
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
+                # Memoized query results, dropped whenever the index generation moves on
+                self._result_cache = OrderedDict()
+                self._result_lock = threading.Lock()
+                self._cache_generation = self.index.generation
+
+                # Sentence embedding model for semantic search (or an already loaded one to share),
+                # loaded on first search so SPARQL-only use never imports torch
+                self._embedder = embedder
+                self._embedder_options = {"backend": backend, "num_threads": num_threads, "batch_size": batch_size}
+
+        @property
+        def embedder(self):
+                if self._embedder is None:
+                        self._embedder = EmbeddingBackend(DEFAULT_MODEL_NAME, **self._embedder_options)
+                return self._embedder
 
         def search_query(self, query_str, threshold=0.3):
                 """Semantic search in the knowledge graph"""
-                query_embedding = self.model.encode(query_str, convert_to_tensor=True)
-                results = []
-
-                # Search through text properties
-                for node, text in self.g.subject_objects(self.EX.hasText):
-                        text_str = str(text)
-                        text_embedding = self.model.encode(text_str, convert_to_tensor=True)
-                        cosine_score = util.pytorch_cos_sim(query_embedding, text_embedding).item()
-                        if cosine_score >= threshold:
-                                results.append((node, text_str, cosine_score))
-
-                # Sort results by similarity
-                results.sort(key=lambda x: x[2], reverse=True)
+                with metrics.stage("search") as record:
+                        query_embedding = self.embedder.encode(query_str)
+
+                        # Collect text properties and encode them in batches
+                        nodes, texts = [], []
+                        for node, text in self.index.texts():
+                                nodes.append(node)
+                                texts.append(str(text))
+                        record["candidates"] = len(texts)
+                        if not texts:
+                                return []
+
+                        # Embeddings are normalised, so the dot product is the cosine similarity
+                        scores = self.embedder.encode(texts) @ query_embedding
+                        results = [
+                                (node, text_str, float(score))
+                                for node, text_str, score in zip(nodes, texts, scores)
+                                if score >= threshold
+                        ]
+
+                        # Sort results by similarity
+                        results.sort(key=lambda x: x[2], reverse=True)
+                        record["results"] = len(results)
                 return results
 
-        def sparql_query(self, query):
-                """Run a SPARQL query on the knowledge graph"""
-                return self.g.query(query)
\ No newline at end of file
+        @staticmethod
+        def _query_key(query, initNs):
+                return (query, tuple(sorted((prefix, str(ns)) for prefix, ns in (initNs or {}).items())))
+
+        def prepare_query(self, query, initNs=None):
+                """Parse and translate a SPARQL query once, reusing the prepared query on later calls"""
+                key = self._query_key(query, initNs)
+                # The cache is shared by every instance, and so possibly by several threads. Preparing also
+                # happens under the lock, since rdflib's SPARQL parser is not safe to run from two threads at once
+                with self._prepared_lock:
+                        prepared = self._prepared_queries.get(key)
+                        if prepared is not None:
+                                self._prepared_queries.move_to_end(key)
+                                return prepared
+                        
+                        from rdflib.plugins.sparql import prepareQuery
+                        metrics.increment("sparql_prepare_misses")
+                        with metrics.stage("sparql.prepare"):
+                                prepared = prepareQuery(query, initNs=dict(initNs or {}))
+                        self._prepared_queries[key] = prepared
+                        if len(self._prepared_queries) > self.MAX_PREPARED_QUERIES:
+                                self._prepared_queries.popitem(last=False)
+                return prepared
+
+        def sparql_query(self, query, initBindings=None, initNs=None, cache_results=False):
+                """
+                Run a SPARQL query on the knowledge graph
+
+                Values should be passed through initBindings rather than spliced into the query text,
+                so that the same prepared query is reused. With cache_results the result rows are
+                memoized until the graph changes.
+                """
+                prepared = self.prepare_query(query, initNs)
+                metrics.increment("sparql_queries")
+                if not cache_results:
+                        # Rows are evaluated lazily while the caller iterates, so there is no stage to time here
+                        return self.g.query(prepared, initBindings=initBindings)
+
+                generation = self.index.generation
+                # Keyed by query text rather than id(prepared), which may be reused once a prepared query is evicted
+                key = (self._query_key(query, initNs), tuple(sorted((str(var), value) for var, value in (initBindings or {}).items())))
+                with self._result_lock:
+                        if self._cache_generation != generation:
+                                self._result_cache.clear()
+                                self._cache_generation = generation
+                        result = self._result_cache.get(key)
+                        if result is not None:
+                                self._result_cache.move_to_end(key)
+                                metrics.increment("sparql_result_cache_hits")
+                                return result
+                
+                metrics.increment("sparql_result_cache_misses")
+                with metrics.stage("sparql.query"):
+                        result = self.g.query(prepared, initBindings=initBindings)
+                        # Materialise the rows so the cached result can be iterated more than once
+                        if result.type == "SELECT":
+                                result.bindings
+                with self._result_lock:
+                        if self._cache_generation == generation:
+                                self._result_cache[key] = result
+                                if len(self._result_cache) > self.MAX_CACHED_RESULTS:
+                                        self._result_cache.popitem(last=False)
+                return result
@@ -0,0 +1,74 @@
+"""
+Module: tests/test_batch_pipeline.py
+Description: Checks that BatchPipeline reports and merges every page it is given, and always finishes.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("nltk")
+
+import batch_pipeline
+from batch_pipeline import BatchPipeline
+
+
+class FakeFetcher:
+    """Serves small generated pages without a browser; URLs ending in /missing fail"""
+
+    def fetch(self, url, **kwargs):
+        if url.endswith("/missing"):
+            raise ConnectionError(f"Cannot reach {url}")
+        page = url.rsplit("/", 1)[-1]
+        items = "".join(f"<li class='item'>Item {page}.{i} price</li>" for i in range(5))
+        return f"<html><head><title>Page {page}</title></head><body><h1>Page {page}</h1><ul>{items}</ul></body></html>"
+
+
+def run_with_timeout(pipeline, urls, timeout=120):
+    """Run the pipeline on a thread, failing the test instead of hanging if it never returns"""
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault("results", pipeline.run(urls)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "BatchPipeline.run did not return"
+    return outcome["results"]
+
+
+def test_every_page_is_merged_or_reported(monkeypatch):
+    monkeypatch.setattr(batch_pipeline, "WebpageFetcher", FakeFetcher)
+    urls = [f"http://example.org/{i}" for i in range(8)] + ["http://example.org/missing"]
+
+    pipeline = BatchPipeline(reasoner="none", fetch_workers=4, build_workers=2, queue_size=2)
+    results = run_with_timeout(pipeline, urls)
+
+    assert sorted(result["url"] for result in results) == sorted(urls)
+    statuses = {result["url"]: result["status"] for result in results}
+    assert statuses.pop("http://example.org/missing") == "failed"
+    assert set(statuses.values()) == {"ok"}
+    assert len(set(pipeline.g.objects(None, pipeline.EX.url))) == 8
+
+
+def test_broken_pool_reports_pages_instead_of_hanging(monkeypatch):
+    class BreakingPool(ProcessPoolExecutor):
+        """Accepts one page, then behaves like a pool whose worker died"""
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            BreakingPool.submitted += 1
+            if BreakingPool.submitted > 1:
+                raise BrokenProcessPool("A worker process terminated abruptly")
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr(batch_pipeline, "WebpageFetcher", FakeFetcher)
+    monkeypatch.setattr(batch_pipeline, "ProcessPoolExecutor", BreakingPool)
+    urls = [f"http://example.org/{i}" for i in range(6)]
+
+    pipeline = BatchPipeline(reasoner="none", fetch_workers=2, build_workers=1, queue_size=2)
+    results = run_with_timeout(pipeline, urls)
+
+    assert sorted(result["url"] for result in results) == sorted(urls)
+    assert sum(result["status"] == "ok" for result in results) == 1
+    assert sum(result["status"] == "failed" for result in results) == 5
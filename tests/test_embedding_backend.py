@@ -0,0 +1,40 @@
+"""
+Module: tests/test_embedding_backend.py
+Description: Checks that every CPU embedding backend stays within the cosine tolerance of the PyTorch reference.
+Skipped when torch, sentence-transformers, onnxruntime or the model itself is unavailable.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from benchmarks.embedding_benchmark import COSINE_TOLERANCE, make_sentences
+from embedding_backend import EmbeddingBackend
+
+
+@pytest.fixture(scope="module")
+def sentences():
+    return make_sentences(64)
+
+
+@pytest.fixture(scope="module")
+def reference(sentences):
+    try:
+        embedder = EmbeddingBackend(backend="torch")
+    except Exception as e:  # model not cached and no network, etc.
+        pytest.skip(f"Embedding model unavailable: {e}")
+    return embedder.encode(sentences)
+
+
+@pytest.mark.parametrize("backend", ["onnx", "quantized"])
+def test_backend_within_cosine_tolerance_of_torch(backend, sentences, reference):
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+    embeddings = EmbeddingBackend(backend=backend).encode(sentences)
+
+    assert embeddings.shape == reference.shape
+    # Embeddings are normalised, so the row-wise dot product is the cosine similarity
+    cosines = np.sum(embeddings * reference, axis=1)
+    assert float(np.min(cosines)) >= 1.0 - COSINE_TOLERANCE
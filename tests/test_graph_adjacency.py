@@ -0,0 +1,43 @@
+"""
+Module: tests/test_graph_adjacency.py
+Description: Checks the AdjacencyIndex CSR conversion and the sampled betweenness of compute_centrality.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("rdflib")
+
+from rdflib import Graph, Namespace
+
+from graph_adjacency import AdjacencyIndex
+from knowledge_graph import KnowledgeGraph
+
+EX = Namespace("http://example.org/")
+
+
+def test_duplicate_adds_and_removals():
+    g = Graph()
+    adjacency = AdjacencyIndex(g)
+    for _ in range(3):
+        g.add((EX.a, EX.contains, EX.b))
+    assert adjacency._expected_len == len(g) == 1
+    assert adjacency.csr(EX.contains).nnz == 1
+
+    g.remove((EX.a, EX.contains, EX.b))
+    assert adjacency.csr(EX.contains).nnz == 0
+
+
+def test_sampled_betweenness_with_every_source_matches_networkx():
+    nx = pytest.importorskip("networkx")
+    g = Graph()
+    # Two chains joined through a hub, plus an isolated pair
+    for s, o in [("a", "b"), ("b", "hub"), ("hub", "c"), ("c", "d"), ("hub", "e"), ("x", "y")]:
+        g.add((EX[s], EX.contains, EX[o]))
+    kg = KnowledgeGraph(g, str(EX))
+    adjacency = kg.adjacency.csr(symmetric=True)
+
+    exact = nx.betweenness_centrality(nx.from_scipy_sparse_array(adjacency))
+    sampled = kg._sampled_betweenness(adjacency, k=adjacency.shape[0], seed=0)
+    assert np.allclose(sampled, [exact[i] for i in range(adjacency.shape[0])])
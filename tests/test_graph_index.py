@@ -0,0 +1,68 @@
+"""
+Module: tests/test_graph_index.py
+Description: Checks that GraphIndex stays consistent with the store without needless rebuilds.
+"""
+
+import pytest
+
+pytest.importorskip("rdflib")
+
+from rdflib import RDF, RDFS, Graph, Literal, Namespace
+
+from graph_index import GraphIndex
+
+EX = Namespace("http://example.org/")
+
+
+def test_duplicate_adds_do_not_trigger_rebuild(monkeypatch):
+    g = Graph()
+    index = GraphIndex(g, EX)
+    rebuilds = []
+    monkeypatch.setattr(index, "rebuild", lambda: rebuilds.append(1))
+
+    for _ in range(5):
+        g.add((EX.a, EX.hasText, Literal("price")))
+        assert index.text_of(EX.a) == Literal("price")
+    assert rebuilds == []
+
+
+def test_removal_is_detected():
+    g = Graph()
+    index = GraphIndex(g, EX)
+    g.add((EX.a, EX.hasText, Literal("price")))
+    generation = index.generation
+
+    g.remove((EX.a, EX.hasText, None))
+    assert list(index.texts()) == []
+    assert index.generation != generation
+
+
+def test_for_graph_shares_one_index_per_graph():
+    g = Graph()
+    assert GraphIndex.for_graph(g, EX) is GraphIndex.for_graph(g, EX)
+    assert GraphIndex.for_graph(g, EX) is not GraphIndex.for_graph(Graph(), EX)
+
+
+def test_every_text_of_an_element_is_kept():
+    g = Graph()
+    index = GraphIndex(g, EX)
+    # Two elements with the same id share a URI
+    g.add((EX.span_price, EX.hasText, Literal("Price $10")))
+    g.add((EX.span_price, EX.hasText, Literal("Sale price $8")))
+
+    assert sorted(str(text) for _, text in index.texts()) == ["Price $10", "Sale price $8"]
+    g.remove((EX.span_price, EX.hasText, Literal("Price $10")))
+    assert [str(text) for _, text in index.texts()] == ["Sale price $8"]
+
+
+def test_type_of_prefers_the_most_specific_type_after_rebuild():
+    g = Graph()
+    g.add((EX.TextElement, RDFS.subClassOf, EX.Element))
+    # An inferred superclass asserted before the element's own type, as store order may yield after a rebuild
+    g.add((EX.p, RDF.type, EX.Element))
+    g.add((EX.p, RDF.type, EX.TextElement))
+    g.add((EX.div, RDF.type, EX.Element))
+
+    index = GraphIndex(g, EX)
+    assert index.type_of(EX.p) == EX.TextElement
+    assert index.type_of(EX.div) == EX.Element
@@ -0,0 +1,76 @@
+"""
+Module: tests/test_knowledge_graph.py
+Description: Checks that boilerplate subtrees are shared between pages when template sharing is on.
+"""
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from rdflib import Graph, Namespace
+
+import batch_pipeline
+from knowledge_graph import KnowledgeGraph
+from ontology_setup import Ontology
+
+NAMESPACE = "http://example.org/"
+EX = Namespace(NAMESPACE)
+
+NAV = "<nav class='menu'><a href='/shoes'>Shoes</a><a href='/bags'>Bags</a><a href='/sale'>Sale</a></nav>"
+FOOTER = "<footer><p>Help</p><p>Returns</p><p>Contact</p></footer>"
+
+
+def page(title, body):
+    return f"<html><head><title>{title}</title></head><body>{NAV}<main><p>{body}</p></main>{FOOTER}</body></html>"
+
+
+def new_graph():
+    g = Graph()
+    Ontology(g, EX)
+    return g
+
+
+def templates(g):
+    return set(g.subjects(None, EX.TemplateFragment))
+
+
+def test_template_is_shared_between_pages():
+    g = new_graph()
+    for i, body in enumerate(("Black derby shoe", "Brown leather bag")):
+        KnowledgeGraph(g, NAMESPACE, scope=f"p{i}_", share_templates=True).build_knowledge_graph(
+            page(f"Page {i}", body), f"http://example.org/{i}")
+
+    assert len(templates(g)) == 2  # the nav and the footer, once each
+    for template in templates(g):
+        assert len(set(g.objects(template, EX.isChildOf))) == 2
+    # The nav's links are stored once, not once per page
+    assert len(set(g.subjects(EX.hasHref, None))) == 3
+
+
+def test_repeated_subtree_on_one_page_has_no_sibling_self_loop():
+    g = new_graph()
+    html = f"<html><body>{NAV}<p>Black derby shoe</p>{NAV}</body></html>"
+    KnowledgeGraph(g, NAMESPACE, share_templates=True).build_knowledge_graph(html, "http://example.org/0")
+
+    assert len(templates(g)) == 1
+    assert not any(s == o for s, o in g.subject_objects(EX.hasSibling))
+
+
+def test_worker_skips_templates_it_already_returned(monkeypatch):
+    monkeypatch.setattr(batch_pipeline, "_seen_templates", set())
+    first, _ = batch_pipeline.build_page_graph(page("Page 0", "Black derby shoe"), "http://example.org/0",
+                                               NAMESPACE, "p0_", reasoner="none", share_templates=True)
+    second, _ = batch_pipeline.build_page_graph(page("Page 1", "Brown leather bag"), "http://example.org/1",
+                                                NAMESPACE, "p1_", reasoner="none", share_templates=True)
+
+    first_templates = {s for s, p, o in first if o == EX.TemplateFragment}
+    assert len(first_templates) == 2
+    # The second page only links to the templates; their content is not rebuilt
+    assert not any(o == EX.TemplateFragment for s, p, o in second)
+    assert {o for s, p, o in second if p == EX.hasChild} >= first_templates
+
+    merged = Graph()
+    for s, p, o in first + second:
+        merged.add((s, p, o))
+    for template in first_templates:
+        assert len(set(merged.objects(template, EX.isChildOf))) == 2
@@ -0,0 +1,63 @@
+"""
+Module: tests/test_sparql_query_search.py
+Description: Checks the prepared-query and result caches of QueryBasedSearch.
+"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("rdflib")
+
+from rdflib import Graph, Literal, Namespace
+
+import sparql_query_search
+from sparql_query_search import QueryBasedSearch
+
+EX = Namespace("http://example.org/")
+
+TEXT_QUERY = "SELECT ?element WHERE { ?element ex:hasText ?text . FILTER(CONTAINS(?text, ?keyword)) }"
+
+
+@pytest.fixture
+def search(monkeypatch):
+    # SPARQL needs no embedding model
+    monkeypatch.setattr(sparql_query_search, "EmbeddingBackend", lambda *args, **kwargs: None)
+    g = Graph()
+    for i in range(20):
+        g.add((EX[f"e{i}"], EX.hasText, Literal(f"item {i} price")))
+    return QueryBasedSearch(g, EX)
+
+
+def test_result_cache_is_bounded_and_invalidated(search, monkeypatch):
+    monkeypatch.setattr(QueryBasedSearch, "MAX_CACHED_RESULTS", 4)
+    for i in range(10):
+        rows = search.sparql_query(TEXT_QUERY, initBindings={"keyword": Literal(f"item {i} ")},
+                                   initNs={"ex": EX}, cache_results=True)
+        assert len(list(rows)) == 1
+    assert len(search._result_cache) == 4
+
+    search.g.remove((EX.e9, None, None))
+    rows = search.sparql_query(TEXT_QUERY, initBindings={"keyword": Literal("item 9 ")},
+                               initNs={"ex": EX}, cache_results=True)
+    assert list(rows) == []
+
+
+def test_prepared_query_cache_is_bounded_under_threads(search, monkeypatch):
+    monkeypatch.setattr(QueryBasedSearch, "MAX_PREPARED_QUERIES", 8)
+    errors = []
+
+    def prepare(worker):
+        try:
+            for i in range(40):
+                search.prepare_query(f"SELECT ?s WHERE {{ ?s ?p {i % 12} }}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=prepare, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(QueryBasedSearch._prepared_queries) <= 8
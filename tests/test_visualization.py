@@ -0,0 +1,65 @@
+"""
+Module: tests/test_visualization.py
+Description: Checks the containment tree recovered for the level-of-detail summary and its node cap.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("networkx")
+pytest.importorskip("bs4")
+
+from rdflib import Graph, Namespace
+
+from HOL_reasoner import HOL
+from knowledge_graph import KnowledgeGraph
+from ontology_setup import Ontology
+from visualization import VisualizationKG
+
+NAMESPACE = "http://example.org/"
+
+
+def nested_page(sections=6, items=8):
+    """A page with a few levels of nesting, so that reasoning adds ancestor shortcuts"""
+    body = "".join(
+        f'<section id="s{s}"><h2>Section {s}</h2><div class="list">'
+        + "".join(f'<p>Item {s}.{i} with a <a href="/item/{s}/{i}">link</a></p>' for i in range(items))
+        + "</div></section>"
+        for s in range(sections)
+    )
+    return f"<html><head><title>Nested</title></head><body><main>{body}</main></body></html>"
+
+
+@pytest.fixture
+def reasoned_graph():
+    """A page graph after HOL reasoning, whose adjacency index is only created afterwards"""
+    g = Graph()
+    EX = Namespace(NAMESPACE)
+    Ontology(g, EX)
+    kg = KnowledgeGraph(g, NAMESPACE)
+    kg.build_knowledge_graph(nested_page(), "http://example.org/page")
+    built_parents = {child: parent for parent, child in g.subject_objects(EX.contains)}
+    HOL(g, EX, kg.index).apply_higher_order_logic()
+    return g, EX, kg, built_parents
+
+
+def test_tree_parents_ignore_inferred_shortcuts(reasoned_graph):
+    g, EX, kg, built_parents = reasoned_graph
+    # HOL added ancestor -> descendant shortcuts next to the builder's edges
+    assert len(list(g.subject_objects(EX.contains))) > len(built_parents)
+    nodes = kg.adjacency.nodes
+    parents = kg.adjacency.tree_parents(EX.contains)
+
+    recovered = {nodes[child]: nodes[parent] for child, parent in enumerate(parents.tolist()) if parent >= 0}
+    assert recovered == built_parents
+
+
+@pytest.mark.parametrize("max_nodes", [1, 5, 50])
+def test_summary_respects_max_nodes(reasoned_graph, tmp_path, max_nodes):
+    g, EX, kg, _ = reasoned_graph
+    visualizer = VisualizationKG(NAMESPACE, g, kg.index, kg.adjacency)
+
+    summary = visualizer.save_graph_summary(str(tmp_path / "summary.json"), max_nodes=max_nodes)
+    assert len(summary["nodes"]) <= max_nodes
+    assert sum(node["count"] for node in summary["nodes"]) == summary["meta"]["source_nodes"]
@@ -1,58 +1,73 @@
-from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS
-from rdflib.namespace import OWL, XSD
-import networkx as nx
-from nltk.tokenize import sent_tokenize
-from pyvis.network import Network
+import json
+import os
+
+from rdflib import Graph, Namespace, RDFS
+from rdflib.namespace import OWL
+
+from graph_index import GraphIndex
+
+# Minimal viewer for save_graph_summary: loads the JSON on demand and draws it with the precomputed layout
+SUMMARY_VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
+</head>
+<body style="margin:0">
+<div id="graph" style="width:100%;height:100vh"></div>
+<script>
+fetch("__SUMMARY_JSON__").then(r => r.json()).then(data => {
+    data.nodes.forEach(n => { n.value = n.count; });
+    data.edges.forEach(e => { e.value = e.count; e.title = e.count + " edges"; });
+    new vis.Network(document.getElementById("graph"),
+        {nodes: new vis.DataSet(data.nodes), edges: new vis.DataSet(data.edges)},
+        {physics: false, edges: {arrows: "to"}, nodes: {shape: "dot", scaling: {min: 5, max: 40}},
+         interaction: {hover: true, navigationButtons: true, keyboard: true}});
+});
+</script>
+</body>
+</html>
+"""
 
  
 # this class is olny use for make the KG to visualize it
 class VisualizationKG:
-    def __init__(self, base_namespace="http://example.org/"):
-        # Initialize RDF graph
-        self.g = Graph()
+    def __init__(self, base_namespace="http://example.org/", graph=None, index=None, adjacency=None):
+        # Initialize RDF graph (or reuse an existing knowledge graph)
+        self.g = graph if graph is not None else Graph()
         self.EX = Namespace(base_namespace)
         self.g.bind("ex", self.EX)
         self.g.bind("owl", OWL)
         self.g.bind("rdfs", RDFS)
+        self.index = index if index is not None else GraphIndex.for_graph(self.g, self.EX)
+        self._adjacency = adjacency
         
 
-    def save_graph_visualization(self, nx_graph=None, filename="knowledge_graph.html"):
+    @property
+    def adjacency(self):
+            """Integer node IDs and CSR adjacency of the graph, created on first use"""
+            if self._adjacency is None:
+                from graph_adjacency import AdjacencyIndex
+                self._adjacency = AdjacencyIndex.for_graph(self.g)
+            return self._adjacency
+
+    def save_graph_visualization(self, adjacency=None, filename="knowledge_graph.html"):
             """Save an interactive visualization of the graph"""
-            if nx_graph is None:
-                nx_graph = nx.Graph()
-                for s, p, o in self.g:
-                    if isinstance(s, URIRef) and isinstance(o, URIRef):
-                        nx_graph.add_edge(s, o, type=str(p))
+            from pyvis.network import Network
+            
+            if adjacency is None:
+                adjacency = self.adjacency
             
             # Create a pyvis network
             net = Network(height="800px", width="100%", notebook=False, directed=True)
             
             # Add nodes
-            for node in nx_graph.nodes():
-                node_type = None
-                for _, p, o in self.g.triples((node, RDF.type, None)):
-                    node_type = o
-                    break
-                
+            for node in adjacency.nodes:
                 node_label = str(node).split('/')[-1]
-                node_color = "#9CBABA"  # Default color
-                
-                # Color nodes by type
-                if node_type:
-                    if node_type == self.EX.TextElement:
-                        node_color = "#6BAED6"
-                    elif node_type == self.EX.StructuralElement:
-                        node_color = "#FD8D3C"
-                    elif node_type == self.EX.LinkElement:
-                        node_color = "#74C476"
-                    elif node_type == self.EX.FormElement:
-                        node_color = "#9E9AC8"
+                node_color = self._node_color(self.index.type_of(node))
                 
                 # Get tag if available
-                tag = None
-                for _, _, o in self.g.triples((node, self.EX.hasTag, None)):
-                    tag = str(o)
-                    break
+                tag = self.index.tag_of(node)
                 
                 # Format label with tag if available
                 if tag:
@@ -61,8 +76,11 @@ class VisualizationKG:
                 net.add_node(str(node), label=node_label, title=str(node), color=node_color)
             
             # Add edges
-            for source, target, data in nx_graph.edges(data=True):
-                edge_type = data.get('type', '')
+            nodes = adjacency.nodes
+            sources, targets, predicate_ids = adjacency.undirected_edges()
+            for source_id, target_id, predicate_id in zip(sources.tolist(), targets.tolist(), predicate_ids.tolist()):
+                source, target = nodes[source_id], nodes[target_id]
+                edge_type = adjacency.predicates[predicate_id]
                 if 'hasChild' in str(edge_type):
                     color = "blue"
                 elif 'hasSibling' in str(edge_type):
@@ -101,6 +119,148 @@ class VisualizationKG:
             net.save_graph(filename)
             print(f"Graph visualization saved to {filename}")
         
+    def _node_color(self, node_type):
+            """Color nodes by type"""
+            if node_type == self.EX.TextElement:
+                return "#6BAED6"
+            elif node_type == self.EX.StructuralElement:
+                return "#FD8D3C"
+            elif node_type == self.EX.LinkElement:
+                return "#74C476"
+            elif node_type == self.EX.FormElement:
+                return "#9E9AC8"
+            return "#9CBABA"  # Default color
+
+    def _summarize(self, parents, group_by, max_depth):
+            """
+            Map each node of the containment tree to a level-of-detail node.
+
+            Nodes up to max_depth below a root are kept as they are; every deeper node is folded into a
+            summary node keyed by its ancestor at max_depth and its tag (or type).
+            Returns (lod_of, members) where lod_of maps node IDs to LOD keys and members maps LOD keys
+            to the node IDs they stand for.
+            """
+            children = {}
+            for child, parent in enumerate(parents.tolist()):
+                if parent >= 0:
+                    children.setdefault(parent, []).append(child)
+            roots = [node_id for node_id in children if parents[node_id] < 0]
+            
+            nodes = self.adjacency.nodes
+            lod_of, members = {}, {}
+            stack = [(root, 0, None) for root in roots]
+            while stack:
+                node_id, depth, anchor = stack.pop()
+                if depth <= max_depth:
+                    key = ("node", node_id)
+                    child_anchor = node_id
+                else:
+                    node = nodes[node_id]
+                    group = self.index.tag_of(node) if group_by == "tag" else self.index.type_of(node)
+                    key = ("summary", anchor, str(group).split('/')[-1])
+                    child_anchor = anchor
+                lod_of[node_id] = key
+                members.setdefault(key, []).append(node_id)
+                stack.extend((child, depth + 1, child_anchor) for child in children.get(node_id, ()))
+            return lod_of, members
+
+    def _cap(self, lod_of, members, max_nodes):
+            """
+            Fold the smallest LOD nodes into one "other" summary node until at most max_nodes remain.
+
+            Used when even max_depth 0 leaves too many nodes (many roots, or many tags under them).
+            """
+            if len(members) <= max_nodes:
+                return lod_of, members
+            ranked = sorted(members, key=lambda key: len(members[key]), reverse=True)
+            other = ("summary", None, "other")
+            capped = {key: members[key] for key in ranked[:max_nodes - 1]}
+            capped[other] = []
+            for key in ranked[max_nodes - 1:]:
+                for node_id in members[key]:
+                    lod_of[node_id] = other
+                    capped[other].append(node_id)
+            return lod_of, capped
+
+    def save_graph_summary(self, filename="knowledge_graph_summary.json", group_by="tag", max_depth=4,
+                           max_nodes=500, max_edges=2000, html_filename=None):
+            """
+            Save a level-of-detail summary of the HTML containment tree for large graphs
+
+            Subtrees below max_depth are collapsed into summary nodes per tag (or type) with member
+            counts; max_depth is lowered until at most max_nodes remain, and if that is not enough the
+            smallest nodes are folded into a single "other" node. Only the max_edges heaviest edges
+            are kept. The layout is computed here, so the viewer renders with physics off. The result
+            is written as compact JSON, plus an optional HTML viewer that fetches it on load (serve
+            the directory over HTTP, e.g. python -m http.server).
+            """
+            if group_by not in ("tag", "type"):
+                raise ValueError(f"Unknown group_by '{group_by}', expected 'tag' or 'type'")
+            if max_nodes < 1:
+                raise ValueError(f"max_nodes must be at least 1, got {max_nodes}")
+            import networkx as nx
+            
+            nodes = self.adjacency.nodes
+            parents = self.adjacency.tree_parents(self.EX.contains)
+            depth = max_depth
+            lod_of, members = self._summarize(parents, group_by, depth)
+            while len(members) > max_nodes and depth > 0:
+                depth -= 1
+                lod_of, members = self._summarize(parents, group_by, depth)
+            lod_of, members = self._cap(lod_of, members, max_nodes)
+            
+            # Aggregate tree edges between LOD nodes, heaviest first
+            edge_counts = {}
+            for child, parent in enumerate(parents.tolist()):
+                if parent < 0 or child not in lod_of:
+                    continue
+                edge = (lod_of[parent], lod_of[child])
+                if edge[0] != edge[1]:
+                    edge_counts[edge] = edge_counts.get(edge, 0) + 1
+            edges = sorted(edge_counts.items(), key=lambda item: item[1], reverse=True)[:max_edges]
+            
+            # Offline layout of the (small) summary graph
+            lod_ids = {key: i for i, key in enumerate(members)}
+            layout_graph = nx.Graph()
+            layout_graph.add_nodes_from(lod_ids.values())
+            layout_graph.add_edges_from((lod_ids[a], lod_ids[b]) for (a, b), _ in edges)
+            positions = nx.spring_layout(layout_graph, seed=42) if lod_ids else {}
+            scale = 40 * max(len(lod_ids), 1) ** 0.5
+            
+            summary_nodes = []
+            for key, lod_id in lod_ids.items():
+                count = len(members[key])
+                if key[0] == "node":
+                    node = nodes[key[1]]
+                    tag = self.index.tag_of(node)
+                    label = f"{tag}: {str(node).split('/')[-1]}" if tag else str(node).split('/')[-1]
+                    color = self._node_color(self.index.type_of(node))
+                    title = str(node)
+                else:
+                    label = f"{key[2]} x{count}"
+                    color = self._node_color(self.index.type_of(nodes[members[key][0]]))
+                    under = f" under {nodes[key[1]]}" if key[1] is not None else ""
+                    title = f"{count} collapsed {key[2]} elements{under}"
+                x, y = positions[lod_id]
+                summary_nodes.append({"id": lod_id, "label": label, "title": title, "count": count,
+                                      "color": color, "x": round(float(x) * scale, 1), "y": round(float(y) * scale, 1)})
+            
+            summary = {
+                "meta": {"group_by": group_by, "max_depth": depth, "source_nodes": len(lod_of),
+                         "nodes": len(summary_nodes), "edges": len(edges)},
+                "nodes": summary_nodes,
+                "edges": [{"from": lod_ids[a], "to": lod_ids[b], "count": count} for (a, b), count in edges],
+            }
+            with open(filename, "w") as f:
+                json.dump(summary, f, separators=(",", ":"))
+            print(f"Graph summary saved to {filename} ({len(summary_nodes)} nodes for {len(lod_of)} elements)")
+            
+            if html_filename:
+                with open(html_filename, "w") as f:
+                    f.write(SUMMARY_VIEWER_HTML.replace("__SUMMARY_JSON__", os.path.basename(filename)))
+                print(f"Graph summary viewer saved to {html_filename}")
+            return summary
+
     def save_to_file(self, filename="knowledge_graph.ttl", format="turtle"):
             """Save the RDF graph to a file"""
             self.g.serialize(destination=filename, format=format)
@@ -4,8 +4,8 @@ Description: Implements the WebpageFetcher class responsible for dynamically fet
 """
 
 import time
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from common import validate_url, InvalidURLException, FetchTimeoutError, WebpageFetchError, logger
+from instrumentation import metrics
 
 class WebpageFetcher:
     """
@@ -38,52 +38,63 @@ class WebpageFetcher:
             logger.error(f"Invalid URL provided: {url}")
             raise InvalidURLException(f"Invalid URL: {url}")
 
+        # Imported here so that importing this module does not load Playwright
+        from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
         for attempt in range(retries):
+            metrics.increment("fetch_attempts")
             try:
                 with sync_playwright() as p:
                     browser = p.chromium.launch(headless=True)
                     page = browser.new_page()
-                    page.goto(url, timeout=timeout * 1000)
-                    page.wait_for_load_state("load", timeout=timeout * 1000)
+                    with metrics.stage("fetch.navigate", url=url):
+                        page.goto(url, timeout=timeout * 1000)
+                    with metrics.stage("fetch.load", url=url):
+                        page.wait_for_load_state("load", timeout=timeout * 1000)
 
                     # Clean up DOM before extracting content
-                    page.evaluate("""() => {
-                        // Remove script-related elements
-                        document.querySelectorAll('script, noscript').forEach(e => e.remove());
+                    with metrics.stage("fetch.clean", url=url) as record:
+                        page.evaluate("""() => {
+                            // Remove script-related elements
+                            document.querySelectorAll('script, noscript').forEach(e => e.remove());
                         
-                        // Remove style-related elements
-                        document.querySelectorAll('style, link[rel="stylesheet"]').forEach(e => e.remove());
+                            // Remove style-related elements
+                            document.querySelectorAll('style, link[rel="stylesheet"]').forEach(e => e.remove());
                         
-                        // Remove images and visual media
-                        document.querySelectorAll('img, picture, figure, svg, canvas').forEach(e => e.remove());
+                            // Remove images and visual media
+                            document.querySelectorAll('img, picture, figure, svg, canvas').forEach(e => e.remove());
                         
-                        // Remove links while preserving text
-                        document.querySelectorAll('a').forEach(a => {
-                            const parent = a.parentNode;
-                            while (a.firstChild) {
-                                parent.insertBefore(a.firstChild, a);
-                            }
-                            parent.removeChild(a);
-                        });
+                            // Remove links while preserving text
+                            document.querySelectorAll('a').forEach(a => {
+                                const parent = a.parentNode;
+                                while (a.firstChild) {
+                                    parent.insertBefore(a.firstChild, a);
+                                }
+                                parent.removeChild(a);
+                            });
                         
-                        // Remove HTML comments
-                        const commentWalker = document.createTreeWalker(
-                            document,
-                            NodeFilter.SHOW_COMMENT
-                        );
-                        let commentNode;
-                        while ((commentNode = commentWalker.nextNode())) {
-                            commentNode.parentNode.removeChild(commentNode);
-                        }
-                    }""")
+                            // Remove HTML comments
+                            const commentWalker = document.createTreeWalker(
+                                document,
+                                NodeFilter.SHOW_COMMENT
+                            );
+                            let commentNode;
+                            while ((commentNode = commentWalker.nextNode())) {
+                                commentNode.parentNode.removeChild(commentNode);
+                            }
+                        }""")
 
-                    html = page.content()
+                        html = page.content()
+                        record["bytes"] = len(html.encode("utf-8"))
                     browser.close()
+                    metrics.increment("fetch_bytes", record["bytes"])
                     logger.info(f"Cleaned webpage fetched on attempt {attempt+1} for URL: {url}")
                     return html
             except PlaywrightTimeoutError as te:
+                metrics.increment("fetch_failures", reason="timeout")
                 logger.warning(f"Timeout on attempt {attempt+1} for URL {url}: {te}")
             except Exception as e:
+                metrics.increment("fetch_failures", reason="error")
                 logger.error(f"Error fetching URL {url} on attempt {attempt+1}: {e}")
             time.sleep(delay * (2 ** attempt))
         logger.error(f"Failed to fetch webpage after {retries} attempts for URL: {url}")